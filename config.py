@@ -191,6 +191,14 @@ Uses secure permissions (755) that allow:
 This allows proper directory access while maintaining security.
 """
 
+_INVALID_FOLDER_CHARS = frozenset('`$')
+"""frozenset: Characters rejected in INPUT_FOLDER/OUTPUT_FOLDER besides '/'
+
+Backtick and dollar sign start command or variable substitution when a
+name is pasted into a shell, so they are never valid in a folder name.
+Other punctuation (e.g. 'R&D') stays allowed.
+"""
+
 
 def validate_config() -> bool:
     """
@@ -215,7 +223,8 @@ def validate_config() -> bool:
     Validation Checks:
         - GEMINI_API_KEY is present and non-empty
         - Model name is valid (if specified)
-        - Folder names are valid (if specified)
+        - Folder names are valid (if specified): no path separators
+          or shell substitution characters
         
     Security:
         - Does not log or expose API key values
@@ -243,7 +252,8 @@ def validate_config() -> bool:
     
     # Validate folder names (basic security check)
     for folder_name, folder_var in [(INPUT_FOLDER, 'INPUT_FOLDER'), (OUTPUT_FOLDER, 'OUTPUT_FOLDER')]:
-        if not folder_name or '..' in folder_name or '/' in folder_name:
+        if (not folder_name or '..' in folder_name or '/' in folder_name
+                or not _INVALID_FOLDER_CHARS.isdisjoint(folder_name)):
             raise ValueError(
                 f"{folder_var} contains invalid characters. "
                 "Folder names should be simple directory names without path separators."
@@ -0,0 +1,90 @@
+"""
+Shared pytest configuration for the test suite.
+
+Installs lightweight module stubs for the heavy external dependencies
+(Gemini SDK, PyMuPDF, Pillow, Gradio) that are not installed, so test
+modules can import the application code without those packages. Installed
+packages are imported and used as-is. Stubs are plain modules carrying
+only the attributes the tests touch; modules that need richer doubles
+still assign their own ``MagicMock`` objects into ``sys.modules``.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+_STUBBED_MODULES = (
+    "google",
+    "google.generativeai",
+    "pymupdf",
+    "PIL",
+    "PIL.Image",
+    "gradio",
+)
+
+# Names that had to be stubbed; real packages are left untouched
+_stubbed = set()
+
+for _name in _STUBBED_MODULES:
+    try:
+        importlib.import_module(_name)
+    except ImportError:
+        sys.modules[_name] = types.ModuleType(_name)
+        _stubbed.add(_name)
+
+
+class _StubImage:
+    """Minimal stand-in for a ``PIL.Image.Image`` used as a context manager"""
+
+    size = (1, 1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def thumbnail(self, *args, **kwargs):
+        pass
+
+
+class _StubGenerativeModel:
+    """Placeholder model; tests replace ``GeminiPDFOCR._model`` with a Mock"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+# Attach only what the application touches at import/construction time,
+# and only to stubs
+if "google.generativeai" in _stubbed:
+    _genai = sys.modules["google.generativeai"]
+    _genai.configure = lambda *args, **kwargs: None
+    _genai.GenerativeModel = _StubGenerativeModel
+    _genai.GenerationConfig = types.SimpleNamespace
+    sys.modules["google"].generativeai = _genai
+
+if "PIL.Image" in _stubbed:
+    _image = sys.modules["PIL.Image"]
+    _image.open = lambda *args, **kwargs: _StubImage()
+    _image.Resampling = types.SimpleNamespace(LANCZOS="LANCZOS")
+    sys.modules["PIL"].Image = _image
+
+if "gradio" in _stubbed:
+    sys.modules["gradio"].Progress = lambda *args, **kwargs: None
+
+
+def pytest_configure(config):
+    """Register custom markers"""
+    config.addinivalue_line(
+        "markers", "slow: long-running test, deselect with -m 'not slow'"
+    )
+    if not config.pluginmanager.hasplugin("forked"):
+        # Without pytest-forked the mark is inert and the test runs in-process
+        config.addinivalue_line(
+            "markers", "forked: run the test in a forked subprocess"
+        )
@@ -5,14 +5,38 @@ Security Test Runner and Vulnerability Assessment
 Runs comprehensive security tests and provides detailed vulnerability analysis.
 """
 
-import unittest
 import sys
 import os
 from pathlib import Path
 
+import pytest
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+
+class SecurityResultCollector:
+    """pytest plugin that records outcomes as unittest-style (test, traceback) pairs"""
+    
+    def __init__(self):
+        self.testsRun = 0
+        self.failures = []
+        self.errors = []
+    
+    def pytest_runtest_logreport(self, report):
+        if report.when == 'setup':
+            self.testsRun += 1
+        if not report.failed:
+            return
+        if report.when == 'call':
+            self.failures.append((report.nodeid, report.longreprtext))
+        else:
+            # Fixture setup/teardown problems are execution errors
+            self.errors.append((report.nodeid, report.longreprtext))
+    
+    def wasSuccessful(self):
+        return not (self.failures or self.errors)
+
 def run_security_tests():
     """Run all security tests with detailed vulnerability analysis"""
     
@@ -26,26 +50,17 @@ def run_security_tests():
     print("  • OWASP Top 10 compliance")
     print("=" * 60)
     
-    # Load security tests
-    loader = unittest.TestLoader()
-    start_dir = Path(__file__).parent
+    # Security tests rely on pytest fixtures, so run them through pytest
+    test_file = Path(__file__).parent / 'test_security.py'
+    result = SecurityResultCollector()
     
-    try:
-        suite = loader.loadTestsFromName('test_security')
-        print("✅ Security test suite loaded successfully")
-    except Exception as e:
-        print(f"❌ Failed to load security tests: {e}")
+    # Slow tests (e.g. the temp-file race check) are left for full runs
+    exit_code = pytest.main([str(test_file), '-v', '-m', 'not slow'], plugins=[result])
+    if exit_code in (pytest.ExitCode.INTERRUPTED, pytest.ExitCode.USAGE_ERROR,
+                     pytest.ExitCode.INTERNAL_ERROR, pytest.ExitCode.NO_TESTS_COLLECTED):
+        print(f"❌ Failed to load security tests (pytest exit code {exit_code})")
         return False
-    
-    # Run tests with detailed output
-    runner = unittest.TextTestRunner(
-        verbosity=2,
-        stream=sys.stdout,
-        descriptions=True,
-        failfast=False
-    )
-    
-    result = runner.run(suite)
+    print("✅ Security test suite loaded successfully")
     
     # Analyze security test results
     print("\n" + "=" * 60)
@@ -80,7 +95,7 @@ def run_security_tests():
     if result.failures:
         print(f"\n🚨 CRITICAL VULNERABILITIES FOUND ({failures}):")
         for i, (test, traceback) in enumerate(result.failures, 1):
-            test_name = str(test).split('.')[-1]
+            test_name = str(test).split('::')[-1]
             print(f"\n{i}. {test_name}")
             
             # Extract vulnerability type
@@ -20,11 +20,27 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Mock the imports that might not be available in test environment
-sys.modules['pdf_ocr'] = MagicMock()
-
 import call_module as call  # Import as call to avoid conflicts
 
+# call_module imports pdf_ocr lazily, so the mock only has to be in place
+# while these tests run; other test modules must still get the real module
+_real_pdf_ocr = None
+
+
+def setUpModule():
+    """Mock the imports that might not be available in test environment"""
+    global _real_pdf_ocr
+    _real_pdf_ocr = sys.modules.get('pdf_ocr')
+    sys.modules['pdf_ocr'] = MagicMock()
+
+
+def tearDownModule():
+    """Restore the real pdf_ocr module for the remaining test modules"""
+    if _real_pdf_ocr is None:
+        sys.modules.pop('pdf_ocr', None)
+    else:
+        sys.modules['pdf_ocr'] = _real_pdf_ocr
+
 
 class TestGetDirectoryInfo(unittest.TestCase):
     """Test directory information gathering functionality"""
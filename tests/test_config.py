@@ -231,7 +231,9 @@ class TestValidateConfig(unittest.TestCase):
             ('INPUT_FOLDER', '../malicious'),
             ('OUTPUT_FOLDER', '/absolute/path'),
             ('INPUT_FOLDER', ''),
-            ('OUTPUT_FOLDER', 'folder/with/slash')
+            ('OUTPUT_FOLDER', 'folder/with/slash'),
+            ('INPUT_FOLDER', 'folder`whoami`'),
+            ('OUTPUT_FOLDER', 'folder$(id)')
         ]
         
         for folder_var, folder_value in test_cases:
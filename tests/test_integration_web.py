@@ -149,44 +149,46 @@ class TestEndToEndWebWorkflow(unittest.TestCase):
         results = []
         errors = []
         
+        # Mock OCR with delay to simulate processing
+        mock_ocr = MagicMock()
+        def mock_process(*args, **kwargs):
+            time.sleep(0.1)  # Simulate processing time
+            return ["Content from request"]
+        mock_ocr.process_pdf.side_effect = mock_process
+        
         def process_request(request_id):
             try:
                 mock_file = MagicMock()
                 mock_file.name = self.test_pdf
                 
-                with patch('gradio_app.validate_pdf_file', return_value=(True, "Valid")):
-                    with patch('gradio_app.GEMINI_API_KEY', 'test_key'):
-                        with patch('gradio_app.validate_config', return_value=True):
-                            
-                            # Mock OCR with delay to simulate processing
-                            mock_ocr = MagicMock()
-                            def mock_process(*args, **kwargs):
-                                time.sleep(0.1)  # Simulate processing time
-                                return [f"Content from request {request_id}"]
-                            mock_ocr.process_pdf.side_effect = mock_process
-                            
-                            with patch('tempfile.mkdtemp', return_value=self.test_dir):
-                                with patch('shutil.copy2'):
-                                    with patch('gradio_app.GeminiPDFOCR', return_value=mock_ocr):
-                                        with patch('pathlib.Path.exists', return_value=True):
-                                            with patch('builtins.open', mock_open(read_data=f"Result {request_id}")):
-                                                
-                                                status, content, download = gradio_app.process_pdf_file(mock_file)
-                                                results.append((request_id, status, content))
+                status, content, download = gradio_app.process_pdf_file(mock_file)
+                results.append((request_id, status, content))
                             
             except Exception as e:
                 errors.append((request_id, str(e)))
         
-        # Start multiple concurrent requests
+        # Patch once on the main thread: patch() swaps module globals, so
+        # entering and exiting the same patches from several threads
+        # interleaves and leaves mocks installed after the test
         threads = []
-        for i in range(3):
-            thread = threading.Thread(target=process_request, args=(i,))
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join(timeout=5)
+        with patch('gradio_app.validate_pdf_file', return_value=(True, "Valid")):
+            with patch('gradio_app.GEMINI_API_KEY', 'test_key'):
+                with patch('gradio_app.validate_config', return_value=True):
+                    with patch('tempfile.mkdtemp', return_value=self.test_dir):
+                        with patch('shutil.copy2'):
+                            with patch('gradio_app.GeminiPDFOCR', return_value=mock_ocr):
+                                with patch('pathlib.Path.exists', return_value=True):
+                                    with patch('builtins.open', mock_open(read_data="Result")):
+                                        
+                                        # Start multiple concurrent requests
+                                        for i in range(3):
+                                            thread = threading.Thread(target=process_request, args=(i,))
+                                            threads.append(thread)
+                                            thread.start()
+                                        
+                                        # Wait for all threads to complete
+                                        for thread in threads:
+                                            thread.join(timeout=5)
         
         # Verify results
         self.assertEqual(len(results), 3)
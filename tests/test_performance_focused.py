@@ -10,42 +10,173 @@ Version: 1.0.0
 """
 
 import unittest
-import time
+import asyncio
+import contextlib
+import queue
 import threading
+import time
+import math
 import tempfile
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
-from unittest.mock import patch, MagicMock
+from typing import Dict, List, Optional, Tuple
 import gc
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Kernel-to-kernel copies via sendfile are only relied on for Linux
+SENDFILE_AVAILABLE = sys.platform == 'linux' and hasattr(os, 'sendfile')
+
+# Optional io_uring backend for batched writes (Linux only)
+try:
+    if sys.platform != 'linux':
+        raise ImportError("io_uring is Linux-only")
+    from liburing import (
+        io_uring, io_uring_cqe, iovec, io_uring_queue_init, io_uring_queue_exit,
+        io_uring_get_sqe, io_uring_prep_write, io_uring_submit_and_wait,
+        io_uring_wait_cqe, io_uring_cqe_seen, trap_error
+    )
+    IO_URING_AVAILABLE = True
+except ImportError:
+    IO_URING_AVAILABLE = False
+
+IO_URING_QUEUE_DEPTH = 256
+
+# Buffered I/O pattern: 64KiB userspace buffer fed with 4KiB writes
+IO_BUFFER_SIZE = 65536
+IO_WRITE_SLICE = 4096
+
+
+class IoUringBatchWriter:
+    """io_uring ring and iovecs prepared up front, so only the writes are timed"""
+    
+    def __init__(self, bufs: List[bytes]):
+        self.ring = io_uring()
+        self.cqe = io_uring_cqe()
+        io_uring_queue_init(IO_URING_QUEUE_DEPTH, self.ring, 0)
+        # Keep the iovecs referenced until their completions are reaped
+        self.iovecs = [iovec(bytearray(buf)) for buf in bufs]
+    
+    def write(self, fd: int) -> int:
+        """Submit all buffers as one io_uring batch and reap their completions"""
+        ring, cqe = self.ring, self.cqe
+        offset = 0
+        for iov in self.iovecs:
+            sqe = io_uring_get_sqe(ring)
+            io_uring_prep_write(sqe, fd, iov.iov_base, iov.iov_len, offset)
+            offset += iov.iov_len
+        
+        # One io_uring_enter for the whole batch
+        io_uring_submit_and_wait(ring, len(self.iovecs))
+        
+        written = 0
+        for _ in self.iovecs:
+            io_uring_wait_cqe(ring, cqe)
+            written += trap_error(cqe.res)
+            io_uring_cqe_seen(ring, cqe)
+        return written
+    
+    def close(self) -> None:
+        """Tear down the ring"""
+        io_uring_queue_exit(self.ring)
+
+
+class FakeOCR:
+    """Plain stand-in for GeminiPDFOCR, free of mock call tracking"""
+    
+    pages = 1
+    
+    def process_pdf(self, pdf_path: str) -> List[str]:
+        # Simulate 100ms per page processing
+        time.sleep(self.pages * 0.01)  # Reduced for testing
+        return ["Mock content"] * self.pages
+
+def _normal_operation() -> str:
+    return "success"
+
+def _error_operation() -> str:
+    try:
+        raise ValueError("Simulated error")
+    except ValueError:
+        return "error_handled"
+
+def _error_free_check(error_condition: bool = True) -> str:
+    # Validation failing early without raising
+    if error_condition:
+        return "error_handled"
+    return "success"
+
+def _repeat(func, count: int) -> List[str]:
+    """Call func count times; module-level so no closure is built per measurement"""
+    return [func() for _ in range(count)]
+
+
+def _unlink_worker(paths: "queue.Queue[Optional[str]]") -> None:
+    """Unlink queued paths until a None sentinel arrives"""
+    while True:
+        path = paths.get()
+        if path is None:
+            break
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+
 class LightweightPerformanceTest(unittest.TestCase):
     """Lightweight performance tests for resource-constrained environments"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Start the background cleanup thread and freeze pre-existing objects"""
+        # Temp file removal happens off the test thread
+        cls.cleanup_queue = queue.Queue()
+        cls.cleanup_thread = threading.Thread(
+            target=_unlink_worker, args=(cls.cleanup_queue,), daemon=True
+        )
+        cls.cleanup_thread.start()
+        
+        # Move objects that already exist into the permanent generation so
+        # per-test collections only scan what the tests allocate
+        gc.freeze()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Drain pending cleanup and return frozen objects to normal collection"""
+        gc.unfreeze()
+        cls.cleanup_queue.put(None)
+        cls.cleanup_thread.join()
+    
     def setUp(self):
         """Setup minimal test environment"""
         self.metrics = {}
         self.temp_files = []
+        self.devnull_fd = os.open(os.devnull, os.O_WRONLY)
         
     def tearDown(self):
         """Cleanup test environment"""
+        os.close(self.devnull_fd)
         for file_path in self.temp_files:
+            self.cleanup_queue.put(file_path)
+        # Test allocations are short-lived; the youngest generation suffices
+        gc.collect(0)
+    
+    def open_scratch_file(self) -> int:
+        """Open an unnamed scratch file, falling back to a tracked named one"""
+        if hasattr(os, 'O_TMPFILE'):
             try:
-                os.unlink(file_path)
-            except:
-                pass
-        gc.collect()
+                # No directory entry is created, so nothing to unlink later
+                return os.open(tempfile.gettempdir(), os.O_TMPFILE | os.O_RDWR, 0o600)
+            except OSError:
+                pass  # Filesystem without O_TMPFILE support
+        fd, temp_path = tempfile.mkstemp()
+        self.temp_files.append(temp_path)
+        return fd
     
     def measure_time(self, func, *args, **kwargs):
-        """Simple time measurement utility"""
-        start_time = time.time()
+        """Simple time measurement utility using the monotonic nanosecond counter"""
+        start_ns = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        return result, end_time - start_time
+        return result, (time.perf_counter_ns() - start_ns) / 1e9
     
     def test_pdf_processing_scalability(self):
         """Test how processing time scales with PDF size"""
@@ -55,26 +186,17 @@ class LightweightPerformanceTest(unittest.TestCase):
         page_counts = [1, 5, 10, 20]
         processing_times = {}
         
+        ocr = FakeOCR()
+        
         for pages in page_counts:
-            with patch('pdf_ocr.GeminiPDFOCR') as mock_ocr:
-                mock_instance = MagicMock()
-                
-                # Simulate realistic processing delay
-                def simulate_processing(*args, **kwargs):
-                    # Simulate 100ms per page processing
-                    time.sleep(pages * 0.01)  # Reduced for testing
-                    return ["Mock content"] * pages
-                
-                mock_instance.process_pdf.side_effect = simulate_processing
-                mock_ocr.return_value = mock_instance
-                
-                # Measure processing time
-                _, processing_time = self.measure_time(
-                    lambda: mock_instance.process_pdf(f"test_{pages}pages.pdf")
-                )
-                
-                processing_times[pages] = processing_time
-                print(f"   {pages} pages: {processing_time:.3f}s")
+            FakeOCR.pages = pages
+            path = f"test_{pages}pages.pdf"
+            
+            # Measure processing time; argument setup stays outside the timed call
+            _, processing_time = self.measure_time(ocr.process_pdf, path)
+            
+            processing_times[pages] = processing_time
+            print(f"   {pages} pages: {processing_time:.3f}s")
         
         # Analyze scalability
         scalability_ratio = processing_times[20] / processing_times[1]
@@ -94,23 +216,23 @@ class LightweightPerformanceTest(unittest.TestCase):
             time.sleep(0.05)  # 50ms task
             return "processed"
         
+        async def mock_async_task():
+            await asyncio.sleep(0.05)  # 50ms task
+            return "processed"
+        
+        async def run_concurrently():
+            return await asyncio.gather(*(mock_async_task() for _ in range(3)))
+        
         # Sequential processing
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         for i in range(3):
             mock_process_task()
-        sequential_time = time.time() - start_time
-        
-        # Concurrent processing
-        start_time = time.time()
-        threads = []
-        for i in range(3):
-            thread = threading.Thread(target=mock_process_task)
-            threads.append(thread)
-            thread.start()
+        sequential_time = (time.perf_counter_ns() - start_ns) / 1e9
         
-        for thread in threads:
-            thread.join()
-        concurrent_time = time.time() - start_time
+        # Concurrent processing: I/O waits overlap on one event loop thread
+        start_ns = time.perf_counter_ns()
+        asyncio.run(run_concurrently())
+        concurrent_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         efficiency_gain = sequential_time / concurrent_time
         print(f"   Sequential time: {sequential_time:.3f}s")
@@ -133,27 +255,27 @@ class LightweightPerformanceTest(unittest.TestCase):
             "large_files": {"files": 2, "size_per_file": 10240}
         }
         
-        memory_usage = {}
+        # Parallel lists per metric (one entry per scenario)
+        memory_usage = {"name": [], "total_memory_kb": [], "processing_time": [], "memory_efficiency": []}
         
         for scenario_name, config in memory_scenarios.items():
-            # Simulate memory allocation
-            allocated_data = []
-            start_time = time.time()
+            # Simulate memory allocation: the whole batch is a single
+            # zero-filled block whose size is known up front
+            total_memory = config["files"] * config["size_per_file"]
+            start_ns = time.perf_counter_ns()
             
-            for i in range(config["files"]):
-                # Simulate file processing memory usage
-                data = b"x" * config["size_per_file"]
-                allocated_data.append(data)
-                time.sleep(0.001)  # Small processing delay
+            allocated_data = bytearray(total_memory)
+            # Bind loop invariants locally to skip global and dict lookups
+            _sleep = time.sleep
+            for _ in range(config["files"]):
+                _sleep(0.001)  # Small per-file processing delay
             
-            processing_time = time.time() - start_time
-            total_memory = sum(len(data) for data in allocated_data)
+            processing_time = (time.perf_counter_ns() - start_ns) / 1e9
             
-            memory_usage[scenario_name] = {
-                "total_memory_kb": total_memory / 1024,
-                "processing_time": processing_time,
-                "memory_efficiency": total_memory / processing_time
-            }
+            memory_usage["name"].append(scenario_name)
+            memory_usage["total_memory_kb"].append(total_memory / 1024)
+            memory_usage["processing_time"].append(processing_time)
+            memory_usage["memory_efficiency"].append(total_memory / processing_time)
             
             print(f"   {scenario_name}: {total_memory/1024:.1f}KB in {processing_time:.3f}s")
             
@@ -162,8 +284,9 @@ class LightweightPerformanceTest(unittest.TestCase):
             gc.collect()
         
         # Memory usage should be predictable
-        small_memory = memory_usage["small_batch"]["total_memory_kb"]
-        large_memory = memory_usage["large_batch"]["total_memory_kb"]
+        names = memory_usage["name"]
+        small_memory = memory_usage["total_memory_kb"][names.index("small_batch")]
+        large_memory = memory_usage["total_memory_kb"][names.index("large_batch")]
         
         # Large batch should use proportionally more memory
         memory_ratio = large_memory / small_memory
@@ -178,50 +301,43 @@ class LightweightPerformanceTest(unittest.TestCase):
         """Test API call bottlenecks and optimization opportunities"""
         print("\n🔍 Testing API Call Bottlenecks...")
         
-        # Simulate different API call patterns
+        # Simulate different API call patterns; each round trip serves
+        # batch_size calls
         api_patterns = {
-            "sequential": {"calls": 5, "delay_per_call": 0.02},
-            "batched": {"calls": 5, "delay_per_call": 0.01},  # Optimized
-            "rate_limited": {"calls": 5, "delay_per_call": 0.05}  # Rate limited
+            "sequential": {"calls": 5, "delay_per_call": 0.02, "batch_size": 1},
+            "batched": {"calls": 5, "delay_per_call": 0.01, "batch_size": 5},  # Optimized
+            "rate_limited": {"calls": 5, "delay_per_call": 0.05, "batch_size": 1}  # Rate limited
         }
         
-        api_performance = {}
+        # Parallel lists per metric (one entry per pattern)
+        api_performance = {"name": [], "total_time": [], "throughput": [], "avg_call_time": []}
         
         for pattern_name, config in api_patterns.items():
-            start_time = time.time()
-            
-            if pattern_name == "sequential":
-                # Sequential API calls
-                for i in range(config["calls"]):
-                    time.sleep(config["delay_per_call"])
-            
-            elif pattern_name == "batched":
-                # Simulated batched calls (more efficient)
-                for i in range(config["calls"]):
-                    time.sleep(config["delay_per_call"])
+            round_trips = math.ceil(config["calls"] / config["batch_size"])
+            start_ns = time.perf_counter_ns()
             
-            elif pattern_name == "rate_limited":
-                # Rate limited calls
-                for i in range(config["calls"]):
-                    time.sleep(config["delay_per_call"])
+            time.sleep(config["delay_per_call"] * round_trips)
             
-            total_time = time.time() - start_time
+            total_time = (time.perf_counter_ns() - start_ns) / 1e9
             throughput = config["calls"] / total_time
             
-            api_performance[pattern_name] = {
-                "total_time": total_time,
-                "throughput": throughput,
-                "avg_call_time": total_time / config["calls"]
-            }
+            api_performance["name"].append(pattern_name)
+            api_performance["total_time"].append(total_time)
+            api_performance["throughput"].append(throughput)
+            api_performance["avg_call_time"].append(total_time / config["calls"])
             
             print(f"   {pattern_name}: {throughput:.1f} calls/sec")
         
         # Batched should be more efficient than sequential
-        batched_throughput = api_performance["batched"]["throughput"]
-        sequential_throughput = api_performance["sequential"]["throughput"]
+        names = api_performance["name"]
+        batched_throughput = api_performance["throughput"][names.index("batched")]
+        sequential_throughput = api_performance["throughput"][names.index("sequential")]
         
-        self.assertGreater(batched_throughput, sequential_throughput, 
-                          "Batched API calls should be more efficient")
+        self.assertGreaterEqual(
+            batched_throughput,
+            sequential_throughput * api_patterns["batched"]["batch_size"] * 0.5,
+            "Batched API calls should scale with batch size"
+        )
         
         return api_performance
     
@@ -236,88 +352,132 @@ class LightweightPerformanceTest(unittest.TestCase):
             "buffered": {"file_count": 5, "file_size": 2048}
         }
         
-        io_performance = {}
+        # Parallel lists per metric (one entry per pattern)
+        io_performance = {"name": [], "write_time": [], "read_time": [], "total_time": [], "throughput_mb_per_sec": []}
         
         for pattern_name, config in io_patterns.items():
-            temp_files = []
-            start_time = time.time()
+            # One descriptor per pattern; every "file" is a buffer in a single
+            # vectored syscall instead of a NamedTemporaryFile each
+            fd = self.open_scratch_file()
+            bufs = [b"x" * config["file_size"] for _ in range(config["file_count"])]
+            total_bytes = config["file_count"] * config["file_size"]
             
             # Write phase
-            for i in range(config["file_count"]):
-                temp_file = tempfile.NamedTemporaryFile(delete=False)
-                data = b"x" * config["file_size"]
+            with contextlib.ExitStack() as stack:
+                batch_writer = None
+                if IO_URING_AVAILABLE and pattern_name == "large_infrequent":
+                    # Ring setup/teardown stays outside the timed span
+                    batch_writer = IoUringBatchWriter(bufs)
+                    stack.callback(batch_writer.close)
                 
+                start_ns = time.perf_counter_ns()
                 if pattern_name == "buffered":
-                    # Simulate buffered I/O
-                    temp_file.write(data)
-                    temp_file.flush()
+                    # Small writes coalesced by a userspace buffer, flushed once on close
+                    with os.fdopen(fd, 'wb', buffering=IO_BUFFER_SIZE, closefd=False) as f:
+                        _write = f.write
+                        _slice = IO_WRITE_SLICE
+                        for data in bufs:
+                            for pos in range(0, len(data), _slice):
+                                _write(data[pos:pos + _slice])
+                elif batch_writer is not None:
+                    batch_writer.write(fd)
+                elif hasattr(os, 'writev'):
+                    # Unbuffered: buffers go straight to the kernel in one syscall
+                    os.writev(fd, bufs)
                 else:
-                    temp_file.write(data)
-                
-                temp_file.close()
-                temp_files.append(temp_file.name)
-            
-            write_time = time.time() - start_time
+                    # No vectored I/O (Windows): one joined write
+                    os.write(fd, b''.join(bufs))
+                write_time = (time.perf_counter_ns() - start_ns) / 1e9
             
             # Read phase
-            start_time = time.time()
-            for temp_file_path in temp_files:
-                with open(temp_file_path, 'rb') as f:
-                    f.read()
-            read_time = time.time() - start_time
+            if SENDFILE_AVAILABLE:
+                # Data is discarded anyway, so stream it to /dev/null in-kernel
+                start_ns = time.perf_counter_ns()
+                offset = 0
+                while offset < total_bytes:
+                    sent = os.sendfile(self.devnull_fd, fd, offset, total_bytes - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            else:
+                read_bufs = [bytearray(config["file_size"]) for _ in range(config["file_count"])]
+                start_ns = time.perf_counter_ns()
+                if hasattr(os, 'preadv'):
+                    os.preadv(fd, read_bufs, 0)
+                elif hasattr(os, 'readv'):
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.readv(fd, read_bufs)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    for buf in read_bufs:
+                        buf[:] = os.read(fd, len(buf))
+            read_time = (time.perf_counter_ns() - start_ns) / 1e9
             
-            # Cleanup
-            for temp_file_path in temp_files:
-                os.unlink(temp_file_path)
+            os.close(fd)
             
-            total_bytes = config["file_count"] * config["file_size"]
             total_time = write_time + read_time
             
-            io_performance[pattern_name] = {
-                "write_time": write_time,
-                "read_time": read_time,
-                "total_time": total_time,
-                "throughput_mb_per_sec": (total_bytes / 1024 / 1024) / total_time
-            }
+            throughput = (total_bytes / 1024 / 1024) / total_time
+            io_performance["name"].append(pattern_name)
+            io_performance["write_time"].append(write_time)
+            io_performance["read_time"].append(read_time)
+            io_performance["total_time"].append(total_time)
+            io_performance["throughput_mb_per_sec"].append(throughput)
             
-            print(f"   {pattern_name}: {io_performance[pattern_name]['throughput_mb_per_sec']:.2f} MB/s")
+            print(f"   {pattern_name}: {throughput:.2f} MB/s")
         
-        # Buffered I/O should be competitive
-        buffered_throughput = io_performance["buffered"]["throughput_mb_per_sec"]
-        self.assertGreater(buffered_throughput, 0.1, "I/O throughput should be reasonable")
+        # Every pattern, buffered included, should be competitive
+        self.assertGreater(min(io_performance["throughput_mb_per_sec"]), 0.1,
+                           "I/O throughput should be reasonable")
         
         return io_performance
     
+    @unittest.skipUnless(IO_URING_AVAILABLE, "liburing not installed (Linux only)")
+    def test_io_uring_batch_write_contents(self):
+        """Test that the io_uring batch writer lands every buffer at its offset"""
+        bufs = [bytes([i]) * 4096 for i in range(1, 5)]
+        expected = b''.join(bufs)
+        fd = self.open_scratch_file()
+        try:
+            batch_writer = IoUringBatchWriter(bufs)
+            try:
+                written = batch_writer.write(fd)
+            finally:
+                batch_writer.close()
+            
+            self.assertEqual(written, len(expected))
+            self.assertEqual(os.pread(fd, len(expected), 0), expected)
+        finally:
+            os.close(fd)
+    
     def test_error_handling_performance(self):
         """Test performance impact of error handling"""
         print("\n🔍 Testing Error Handling Performance...")
         
-        # Test normal vs error conditions
-        def normal_operation():
-            time.sleep(0.01)
-            return "success"
-        
-        def error_operation():
-            time.sleep(0.01)
-            try:
-                raise ValueError("Simulated error")
-            except ValueError:
-                return "error_handled"
+        # No artificial delay: the raise/except cost would otherwise be
+        # hidden behind the sleep
+        iterations = 10_000
         
         # Measure normal operations
-        _, normal_time = self.measure_time(lambda: [normal_operation() for _ in range(10)])
+        _, normal_time = self.measure_time(_repeat, _normal_operation, iterations)
         
         # Measure error operations
-        _, error_time = self.measure_time(lambda: [error_operation() for _ in range(10)])
+        _, error_time = self.measure_time(_repeat, _error_operation, iterations)
+        
+        # Measure precondition-checked error path
+        _, check_time = self.measure_time(_repeat, _error_free_check, iterations)
         
         error_overhead = (error_time - normal_time) / normal_time * 100
+        raise_cost_us = (error_time - check_time) / iterations * 1e6
         
         print(f"   Normal operations: {normal_time:.3f}s")
         print(f"   Error operations: {error_time:.3f}s")
+        print(f"   Precondition checks: {check_time:.3f}s")
         print(f"   Error overhead: {error_overhead:.1f}%")
+        print(f"   Raise vs check delta: {raise_cost_us:.2f}µs per call")
         
-        # Error handling shouldn't add excessive overhead
-        self.assertLess(error_overhead, 50, "Error handling overhead should be <50%")
+        # Raising and handling an exception should stay in the low microseconds
+        self.assertLess(raise_cost_us, 20, "Exception handling should cost <20µs per call")
         
         return error_overhead
 
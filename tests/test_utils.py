@@ -11,6 +11,7 @@ Tests all critical functions in utils.py including:
 """
 
 import unittest
+import contextlib
 import os
 import tempfile
 import shutil
@@ -18,6 +19,8 @@ import logging
 from pathlib import Path
 from unittest.mock import patch, mock_open, MagicMock
 import sys
+import threading
+from array import array
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -28,6 +31,10 @@ import utils
 class TestGenerateHash(unittest.TestCase):
     """Test hash generation functionality"""
     
+    def tearDown(self):
+        """Clean up test environment"""
+        utils.generate_hash.cache_clear()
+    
     def test_generate_hash_string_input(self):
         """Test hash generation with string input"""
         result = utils.generate_hash("hello world")
@@ -77,6 +84,44 @@ class TestGenerateHash(unittest.TestCase):
         hash1 = utils.generate_hash("input1")
         hash2 = utils.generate_hash("input2")
         self.assertNotEqual(hash1, hash2)
+    
+    def test_generate_hash_memoized(self):
+        """Test that short inputs are served from the cache"""
+        utils.generate_hash.cache_clear()
+        first = utils.generate_hash("cached input")
+        second = utils.generate_hash("cached input")
+        self.assertEqual(first, second)
+        self.assertEqual(utils._generate_hash_str.cache_info().hits, 1)
+        
+        utils.generate_hash.cache_clear()
+        self.assertEqual(utils._generate_hash_str.cache_info().currsize, 0)
+    
+    def test_generate_hash_large_input_not_cached(self):
+        """Test that inputs over the size guard bypass the cache"""
+        utils.generate_hash.cache_clear()
+        utils.generate_hash("a" * 1000)
+        utils.generate_hash(b"a" * 1000)
+        self.assertEqual(utils._generate_hash_str.cache_info().currsize, 0)
+        self.assertEqual(utils._generate_hash_bytes.cache_info().currsize, 0)
+    
+    def test_generate_hash_bytes_matches_generate_hash(self):
+        """Test that the bytes-only variant matches generate_hash"""
+        for data in (b"hello world", b"", b"x" * 1000, "café".encode('utf-8')):
+            self.assertEqual(utils.generate_hash_bytes(data), utils.generate_hash(data))
+        self.assertEqual(utils.generate_hash_bytes(bytearray(b"hello world")),
+                         utils.generate_hash("hello world"))
+    
+    def test_generate_hashes_matches_single(self):
+        """Test that batch hashing matches generate_hash item by item"""
+        items = ["hello world", b"hello world", "", "café 🚀"]
+        expected = [utils.generate_hash(item) for item in items]
+        self.assertEqual(utils.generate_hashes(items), expected)
+    
+    def test_generate_hashes_empty_and_generator(self):
+        """Test batch hashing of an empty batch and a one-shot iterable"""
+        self.assertEqual(utils.generate_hashes([]), [])
+        result = utils.generate_hashes(str(i) for i in range(3))
+        self.assertEqual(len(result), 3)
 
 
 class TestValidateInput(unittest.TestCase):
@@ -165,6 +210,23 @@ class TestValidateInput(unittest.TestCase):
         """Test validation with negative max length"""
         result = utils.validate_input("test", max_length=-1)
         self.assertEqual(result, "")
+    
+    def test_validate_input_memo_bounded(self):
+        """Test that the result memo is reused and stays bounded"""
+        first = utils.validate_input("memo\x00input")
+        self.assertIs(utils.validate_input("memo\x00input"), first)
+        
+        for i in range(utils._VALIDATE_CACHE_SIZE * 2):
+            utils.validate_input(f"input {i}")
+        self.assertLessEqual(len(utils._VALIDATE_CACHE), utils._VALIDATE_CACHE_SIZE)
+    
+    def test_validate_input_memo_skips_long_input(self):
+        """Test that inputs over the memo length limit are not cached"""
+        long_input = "y" * (utils._VALIDATE_CACHE_MAX_LEN + 1)
+        result = utils.validate_input(long_input, max_length=10 ** 6)
+        
+        self.assertEqual(result, long_input)
+        self.assertNotIn(long_input, utils._VALIDATE_CACHE)
 
 
 class TestCreateTempFile(unittest.TestCase):
@@ -183,6 +245,15 @@ class TestCreateTempFile(unittest.TestCase):
             except:
                 pass
     
+    @staticmethod
+    def _read_bytes(path):
+        """Read a file with raw os calls, independent of patched open()"""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            return os.read(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
+    
     def test_create_temp_file_success(self):
         """Test successful temp file creation"""
         content = "Hello, World!"
@@ -246,15 +317,61 @@ class TestCreateTempFile(unittest.TestCase):
     
     def test_create_temp_file_permission_error(self):
         """Test temp file creation with permission error"""
-        with patch('tempfile.NamedTemporaryFile', side_effect=PermissionError("Access denied")):
+        with patch('tempfile.mkstemp', side_effect=PermissionError("Access denied")):
             temp_path = utils.create_temp_file("test content")
             self.assertIsNone(temp_path)
     
     def test_create_temp_file_io_error(self):
         """Test temp file creation with IO error"""
-        with patch('tempfile.NamedTemporaryFile', side_effect=IOError("Disk full")):
+        with patch('utils._writev_all', side_effect=IOError("Disk full")), \
+                patch('os.unlink', wraps=os.unlink) as mock_unlink:
             temp_path = utils.create_temp_file("test content")
             self.assertIsNone(temp_path)
+            # The partially written file is removed
+            mock_unlink.assert_called_once()
+    
+    def test_create_temp_file_chunks_mixed(self):
+        """Test temp file creation from str and bytes chunks"""
+        chunks = ["# Header\n", "Body ñ 世界\n".encode('utf-8'), "", b"", "Footer"]
+        temp_path = utils.create_temp_file_chunks(chunks, suffix=".md")
+        self.temp_files.append(temp_path)
+        
+        self.assertTrue(temp_path.endswith(".md"))
+        self.assertEqual(self._read_bytes(temp_path).decode('utf-8'),
+                         "# Header\nBody ñ 世界\nFooter")
+    
+    def test_create_temp_file_invalid_content(self):
+        """Test that non-string content is rejected"""
+        for content in (None, 0):
+            self.assertIsNone(utils.create_temp_file(content))
+    
+    def test_create_temp_file_chunks_invalid_chunk(self):
+        """Test that a chunk that is neither str nor bytes-like is rejected"""
+        self.assertIsNone(utils.create_temp_file_chunks(["header", None]))
+    
+    def test_create_temp_file_chunks_multibyte_items(self):
+        """Test a bytes-like chunk whose items are wider than one byte"""
+        values = array('i', range(1000))
+        temp_path = utils.create_temp_file_chunks([b"head", values], suffix=".bin")
+        self.assertIsNotNone(temp_path)
+        self.temp_files.append(temp_path)
+        
+        self.assertEqual(self._read_bytes(temp_path), b"head" + values.tobytes())
+    
+    @unittest.skipUnless(hasattr(os, 'writev'), "os.writev not available")
+    def test_create_temp_file_chunks_short_writes(self):
+        """Test that short vectored writes are resumed"""
+        real_writev = os.writev
+        
+        def short_writev(fd, buffers):
+            # Write at most 3 bytes of the first buffer per call
+            return real_writev(fd, [bytes(buffers[0][:3])])
+        
+        with patch('os.writev', side_effect=short_writev):
+            temp_path = utils.create_temp_file_chunks(["abcdefg", b"hij", "k"])
+        self.temp_files.append(temp_path)
+        
+        self.assertEqual(self._read_bytes(temp_path), b"abcdefghijk")
 
 
 class TestSafeFileRead(unittest.TestCase):
@@ -289,6 +406,35 @@ class TestSafeFileRead(unittest.TestCase):
         content = utils.safe_file_read(self.test_dir)
         self.assertIsNone(content)
     
+    def test_safe_file_read_directory_in_base_dir(self):
+        """Test that a directory inside the base directory is rejected"""
+        sub_dir = os.path.join(self.test_dir, "subdir")
+        os.makedirs(sub_dir)
+        content = utils.safe_file_read(sub_dir, base_dir=self.test_dir)
+        self.assertIsNone(content)
+    
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), "os.mkfifo not available")
+    def test_safe_file_read_fifo(self):
+        """Test that a FIFO is rejected without blocking for a writer"""
+        fifo_dir = os.path.join(self.test_dir, "fifo")
+        os.makedirs(fifo_dir)
+        fifo_path = os.path.join(fifo_dir, "pipe")
+        os.mkfifo(fifo_path)
+        results = []
+        
+        reader = threading.Thread(
+            target=lambda: results.append(utils.safe_file_read(fifo_path, base_dir=fifo_dir)),
+            daemon=True,
+        )
+        reader.start()
+        reader.join(timeout=5)
+        
+        if reader.is_alive():
+            # Unblock the reader so the thread can exit
+            os.close(os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK))
+            self.fail("safe_file_read blocked on a FIFO")
+        self.assertEqual(results, [None])
+    
     def test_safe_file_read_with_base_dir_valid(self):
         """Test reading file within allowed base directory"""
         content = utils.safe_file_read(self.test_file, base_dir=self.test_dir)
@@ -318,9 +464,31 @@ class TestSafeFileRead(unittest.TestCase):
         content = utils.safe_file_read(malicious_path, base_dir=self.test_dir)
         self.assertIsNone(content)
     
+    def test_safe_file_read_sibling_prefix_blocked(self):
+        """Test that a sibling sharing the base dir's name prefix is blocked"""
+        sibling_dir = self.test_dir + "other"
+        os.makedirs(sibling_dir)
+        sibling_file = os.path.join(sibling_dir, "secret.txt")
+        with open(sibling_file, 'w') as f:
+            f.write("Sibling content")
+        
+        try:
+            content = utils.safe_file_read(sibling_file, base_dir=self.test_dir)
+            self.assertIsNone(content)
+        finally:
+            shutil.rmtree(sibling_dir, ignore_errors=True)
+    
+    def test_safe_file_read_in_resolved_base(self):
+        """Test reading relative to a pre-resolved base directory"""
+        base = Path(self.test_dir).resolve()
+        self.assertEqual(utils.safe_file_read_in(base, self.test_file), "Test file content")
+        
+        outside = os.path.join(self.test_dir, "..", "outside.txt")
+        self.assertIsNone(utils.safe_file_read_in(base, outside))
+    
     def test_safe_file_read_permission_error(self):
         """Test handling of permission errors"""
-        with patch('builtins.open', side_effect=PermissionError("Access denied")):
+        with patch('os.open', side_effect=PermissionError("Access denied")):
             content = utils.safe_file_read(self.test_file)
             self.assertIsNone(content)
     
@@ -344,6 +512,43 @@ class TestSafeFileRead(unittest.TestCase):
         content = utils.safe_file_read(large_file)
         self.assertEqual(len(content), 100000)
         self.assertEqual(content, large_content)
+    
+    def _write_raw(self, name, data):
+        """Write bytes with raw os calls, independent of patched open()"""
+        path = os.path.join(self.test_dir, "raw", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        return path
+    
+    def test_safe_file_read_universal_newlines(self):
+        """Test that CRLF and lone CR line endings are normalized"""
+        path = self._write_raw("newlines.txt", b"a\r\nb\rc\nd\r\n")
+        self.assertEqual(utils.safe_file_read(path), "a\nb\nc\nd\n")
+    
+    def test_read_fd_text_file_grew_after_fstat(self):
+        """Test that data appended after fstat is still read"""
+        data = b"0123456789" * 10000
+        path = self._write_raw("grew.txt", data)
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            # Size as reported before the file grew
+            self.assertEqual(utils._read_fd_text(fd, 10), data.decode())
+        finally:
+            os.close(fd)
+    
+    def test_read_fd_text_file_shrank_after_fstat(self):
+        """Test that a file truncated after fstat yields the remaining data"""
+        path = self._write_raw("shrank.txt", b"short")
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            # Size as reported before the file shrank
+            self.assertEqual(utils._read_fd_text(fd, 1000), "short")
+        finally:
+            os.close(fd)
 
 
 class TestSetupLogging(unittest.TestCase):
@@ -351,15 +556,15 @@ class TestSetupLogging(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment"""
-        # Clear singleton logger
-        utils._logger = None
+        # Reset logging configuration
+        utils._stop_logging()
         # Remove any existing handlers
         logging.getLogger().handlers.clear()
     
     def tearDown(self):
         """Clean up test environment"""
-        # Clear singleton logger
-        utils._logger = None
+        # Reset logging configuration
+        utils._stop_logging()
         # Remove handlers
         logging.getLogger().handlers.clear()
     
@@ -402,13 +607,33 @@ class TestSetupLogging(unittest.TestCase):
         """Test that logging setup creates proper handlers"""
         logger = utils.setup_logging()
         
-        # Should have both file and console handlers
+        # Root only enqueues; the listener owns the file and console handlers
         root_logger = logging.getLogger()
-        self.assertGreaterEqual(len(root_logger.handlers), 2)
+        root_types = [type(h).__name__ for h in root_logger.handlers]
+        self.assertIn('QueueHandler', root_types)
         
-        handler_types = [type(h).__name__ for h in root_logger.handlers]
+        handler_types = [type(h).__name__ for h in utils._listener.handlers]
         self.assertIn('FileHandler', handler_types)
         self.assertIn('StreamHandler', handler_types)
+    
+    def test_setup_logging_idempotent_per_file(self):
+        """Test that repeat calls for a file add no handlers"""
+        log_dir = tempfile.mkdtemp()
+        log_file = os.path.join(log_dir, "test.log")
+        try:
+            utils.setup_logging(log_file)
+            root_count = len(logging.getLogger().handlers)
+            listener_count = len(utils._listener.handlers)
+            
+            utils.setup_logging(log_file)
+            
+            self.assertEqual(len(logging.getLogger().handlers), root_count)
+            self.assertEqual(len(utils._listener.handlers), listener_count)
+        finally:
+            # Close the file handler before removing its directory
+            utils._stop_logging()
+            with contextlib.suppress(OSError):
+                shutil.rmtree(log_dir)
 
 
 class TestResolvePathCaching(unittest.TestCase):
@@ -429,7 +654,7 @@ class TestResolvePathCaching(unittest.TestCase):
         result2 = utils._resolve_path(test_path)
         
         self.assertEqual(result1, result2)
-        self.assertIsInstance(result1, Path)
+        self.assertIsInstance(result1, str)
     
     def test_resolve_path_cache_info(self):
         """Test cache statistics"""
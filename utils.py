@@ -2,13 +2,16 @@
 Utility Functions Module
 
 This module provides secure, optimized utility functions for the OCR processing application.
-Includes functions for hashing, file operations, input validation, and logging setup.
+Includes functions for hashing (single and batch), file operations, input validation, and logging setup.
 
 Performance optimizations:
 - LRU caching for path resolution
-- Compiled regex patterns for input validation
-- Buffered I/O operations
-- Singleton logger pattern
+- Pre-bound SHA-256 constructor (OpenSSL, SHA-NI where available)
+- LRU memoization of hashes for short inputs
+- str.translate table for input validation
+- Presized os.read file reads
+- mkstemp + os.writev temp file writes, no file object layers
+- Queue-based, non-blocking logging setup
 
 Security features:
 - Path traversal protection
@@ -21,37 +24,91 @@ Version: 2.0.0
 """
 
 import os
+import atexit
 import hashlib
 import tempfile
 import logging
+import queue
+import stat
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from functools import lru_cache
-import re
-from typing import Optional, Union, Any
+from typing import Optional, Union, Any, Iterable, List, Set
 
-# Compiled regex for better performance - matches non-printable ASCII characters
-_PRINTABLE_CHARS = re.compile(r'[^\x20-\x7E]')
+# Translate table deleting non-printable ASCII characters (0x00-0x1F, 0x7F).
+# Non-ASCII characters are dropped separately before translation.
+_STRIP_TABLE = str.maketrans('', '', ''.join(
+    chr(i) for i in range(128) if not 0x20 <= i <= 0x7E
+))
+# Same set as raw bytes, for filtering already-encoded input
+_STRIP_BYTES = bytes(i for i in range(128) if not 0x20 <= i <= 0x7E)
 
+# Small FIFO memo of recent validate_input results, keyed by the truncated
+# input (dicts keep insertion order, so the first key is the oldest). Only
+# short inputs are memoized so callers' max_length cannot pin large strings.
+_VALIDATE_CACHE: dict = {}
+_VALIDATE_CACHE_SIZE = 64
+_VALIDATE_CACHE_MAX_LEN = 256
 
-@lru_cache(maxsize=128)
-def _resolve_path(path_str: str) -> Path:
+# Bound once to skip the module attribute lookup on every hash. hashlib's
+# OpenSSL backend already dispatches to SHA-NI where the CPU supports it.
+_sha256 = hashlib.sha256
+
+# Don't follow a symlink swapped in after resolution; binary mode on Windows.
+# O_NONBLOCK keeps open() from waiting for a writer on a FIFO so the S_ISREG
+# check can reject it; it has no effect on regular files.
+_READ_FLAGS = (os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0)
+               | getattr(os, 'O_NONBLOCK', 0) | getattr(os, 'O_CLOEXEC', 0)
+               | getattr(os, 'O_BINARY', 0))
+
+# Inputs longer than this are hashed without caching so large payloads are
+# never pinned in memory by the memo tables
+_HASH_CACHE_MAX_LEN = 256
+
+# Gather writes go out in batches of at most IOV_MAX buffers; platforms
+# without os.writev (Windows) fall back to a joined write
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+if _IOV_MAX <= 0:
+    _IOV_MAX = 1024
+_HAS_WRITEV = hasattr(os, 'writev')
+
+
+@lru_cache(maxsize=256)
+def _resolve_path(path_str: str) -> str:
     """
     Cached path resolution for better performance.
     
     Uses LRU cache to avoid repeated path resolution operations.
-    Cache size of 128 should handle most common use cases efficiently.
+    Cache size of 256 covers typical working sets of input/output paths.
     
     Args:
         path_str (str): Path string to resolve
         
     Returns:
-        Path: Resolved pathlib.Path object
+        str: Absolute, symlink-resolved path
         
     Note:
         This is an internal function used by other utilities.
-        The cache significantly improves performance for repeated path operations.
+        Uses os.path.realpath directly: no pathlib objects are allocated,
+        callers wrap the result in Path only where one is needed.
     """
-    return Path(path_str).resolve()
+    return os.path.realpath(path_str)
+
+
+@lru_cache(maxsize=4096)
+def _generate_hash_str(data: str) -> str:
+    """Cached SHA-256 of a short string (see generate_hash)"""
+    return _sha256(data.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _generate_hash_bytes(data: bytes) -> str:
+    """Cached SHA-256 of a short bytes value (see generate_hash)"""
+    return _sha256(data).hexdigest()
 
 
 def generate_hash(data: Union[str, bytes]) -> str:
@@ -74,18 +131,118 @@ def generate_hash(data: Union[str, bytes]) -> str:
     Security:
         Uses SHA-256 which is cryptographically secure and suitable for
         security-sensitive applications like session IDs and data integrity checks.
+        
+    Performance:
+        - Module-level ``_sha256`` binding avoids a lookup per call
+        - OpenSSL-backed hashlib uses SHA-NI instructions when available
+        - Inputs up to 256 characters/bytes are memoized (LRU, 4096 entries);
+          call ``generate_hash.cache_clear()`` to reset
     """
     if isinstance(data, str):
+        if len(data) <= _HASH_CACHE_MAX_LEN:
+            return _generate_hash_str(data)
         data = data.encode('utf-8')
-    return hashlib.sha256(data).hexdigest()
+    elif type(data) is bytes and len(data) <= _HASH_CACHE_MAX_LEN:
+        return _generate_hash_bytes(data)
+    return _sha256(data).hexdigest()
+
+
+def _clear_hash_caches() -> None:
+    """Reset the generate_hash memo tables"""
+    _generate_hash_str.cache_clear()
+    _generate_hash_bytes.cache_clear()
+
+
+generate_hash.cache_clear = _clear_hash_caches
+
+
+def generate_hash_bytes(data: bytes) -> str:
+    """
+    Generate SHA-256 hash of already-encoded data.
+    
+    Bytes-only variant of generate_hash for callers that hash the same
+    value repeatedly: encode once (or os.fsencode a path once), keep the
+    bytes, and skip the per-call type dispatch and UTF-8 encoding.
+    
+    Args:
+        data (bytes): Data to hash; any bytes-like object is accepted
+        
+    Returns:
+        str: Hexadecimal representation of the SHA-256 hash
+        
+    Example:
+        >>> key = os.fsencode(pdf_path)
+        >>> generate_hash_bytes(key) == generate_hash(key)
+        True
+        
+    Performance:
+        - Shares generate_hash's memo table for short bytes values
+    """
+    if type(data) is bytes and len(data) <= _HASH_CACHE_MAX_LEN:
+        return _generate_hash_bytes(data)
+    return _sha256(data).hexdigest()
+
+
+def generate_hashes(items: Iterable[Union[str, bytes]]) -> List[str]:
+    """
+    Generate SHA-256 hashes for many items in one call.
+    
+    Batch counterpart of generate_hash for callers that hash many small
+    values (e.g. per-page tokens), where per-call overhead dominates.
+    
+    Args:
+        items (Iterable[Union[str, bytes]]): Values to hash. Strings are encoded as UTF-8.
+        
+    Returns:
+        List[str]: Hexadecimal SHA-256 digests, in input order
+        
+    Example:
+        >>> generate_hashes(["hello world", b""])
+        ['b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9',
+         'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855']
+        
+    Performance:
+        - Single Python call and one comprehension for the whole batch
+        - Hash constructor bound locally, same OpenSSL backend as generate_hash
+    """
+    sha256 = _sha256
+    return [
+        sha256(item.encode('utf-8') if isinstance(item, str) else item).hexdigest()
+        for item in items
+    ]
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of data to fd, resuming after short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _writev_all(fd: int, chunks: List[memoryview]) -> None:
+    """Gather-write byte-format views to fd, resuming after short writes."""
+    if not _HAS_WRITEV:
+        _write_all(fd, b''.join(chunks))
+        return
+    views = [v for v in chunks if v.nbytes]
+    i = 0
+    while i < len(views):
+        written = os.writev(fd, views[i:i + _IOV_MAX])
+        # Skip buffers written in full, trim the partially written one
+        while i < len(views) and written >= len(views[i]):
+            written -= len(views[i])
+            i += 1
+        if written:
+            views[i] = views[i][written:]
 
 
 def create_temp_file(content: str, suffix: str = '.txt') -> Optional[str]:
     """
     Create secure temporary file with optimized I/O.
     
-    Creates a temporary file with secure permissions and optimized buffering.
-    The file is not automatically deleted, allowing the caller to control cleanup.
+    Creates a temporary file with secure permissions and writes the UTF-8
+    encoded content straight to its descriptor. The file is not
+    automatically deleted, allowing the caller to control cleanup.
     
     Args:
         content (str): Content to write to the temporary file
@@ -100,29 +257,69 @@ def create_temp_file(content: str, suffix: str = '.txt') -> Optional[str]:
         ...     print(f"Created temp file: {temp_path}")
         
     Security:
-        - Uses secure temporary file creation with appropriate permissions
-        - Files are created in system temp directory with secure access
+        - mkstemp creates the file exclusively with 0600 permissions
+        - Partially written files are removed on failure
+        
+    Performance:
+        - Encodes once and writes with os.write, no file object or text wrapper
+        - A single syscall for typical content sizes
+    """
+    return create_temp_file_chunks((content,), suffix)
+
+
+def create_temp_file_chunks(chunks: Iterable[Union[bytes, str]],
+                            suffix: str = '.txt') -> Optional[str]:
+    """
+    Create secure temporary file from a sequence of chunks.
+    
+    Lets callers that add headers or footers around a body pass the pieces
+    as-is instead of concatenating them first. String chunks are encoded
+    as UTF-8; bytes-like chunks are written unchanged. Any other chunk
+    type fails the call.
+    
+    Args:
+        chunks (Iterable[Union[bytes, str]]): Pieces written in order
+        suffix (str, optional): File extension suffix. Defaults to '.txt'.
+        
+    Returns:
+        Optional[str]: Path to the created temporary file, or None if creation failed
+        
+    Example:
+        >>> temp_path = create_temp_file_chunks(["# Page 1\n", body, b"\n"], ".md")
         
     Performance:
-        - Uses 8KB buffering for efficient I/O operations
-        - Optimized for both small and large content
+        - All chunks go to the kernel in one os.writev call, no join buffer
     """
+    path = None
     try:
-        # Use optimized buffering for better I/O performance
-        with tempfile.NamedTemporaryFile(mode='w', suffix=suffix, delete=False, buffering=8192) as f:
-            f.write(content)
-            return f.name
+        # memoryview() raises TypeError for anything that is not bytes-like;
+        # cast('B') makes lengths count bytes, as writev's return value does
+        encoded = [
+            memoryview(c.encode('utf-8') if isinstance(c, str) else c).cast('B')
+            for c in chunks
+        ]
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        try:
+            _writev_all(fd, encoded)
+        finally:
+            os.close(fd)
+        return path
     except Exception as e:
         logging.error(f"Failed to create temp file: {e}")
+        if path is not None:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
         return None
 
 
 def validate_input(user_input: Any, max_length: int = 1000) -> Optional[str]:
     """
-    Optimized input validation using compiled regex.
+    Optimized input validation using a str.translate table.
     
     Validates and sanitizes user input by removing non-printable characters
-    and enforcing length limits. Uses compiled regex for better performance.
+    and enforcing length limits. Filtering runs entirely in C via translate().
     
     Args:
         user_input (any): Input to validate (must be string or convertible)
@@ -143,25 +340,54 @@ def validate_input(user_input: Any, max_length: int = 1000) -> Optional[str]:
         - Only allows printable ASCII characters (0x20-0x7E)
         
     Performance:
-        - Fast length check before expensive regex operations
-        - Uses pre-compiled regex pattern for better performance
-        - O(n) complexity with optimized character filtering
+        - Non-positive max_length returns '' without touching the input
+        - Truncates before filtering so only kept characters are scanned
+        - The last 64 distinct inputs of up to 256 characters are memoized
+          (FIFO eviction)
+        - Pure-ASCII input is filtered with one translate() call
+        - Non-ASCII input is narrowed with encode('ascii', 'ignore') and
+          filtered with bytes.translate before a single decode
     """
     # Type check first - fastest validation
     if not isinstance(user_input, str):
         return None
     
+    # Non-positive limits leave nothing to keep
+    if max_length <= 0:
+        return ''
+    
     # Fast length check before expensive operations
     if len(user_input) > max_length:
         user_input = user_input[:max_length]
     
-    # Use compiled regex for better performance
-    # Removes all non-printable ASCII characters
-    cleaned = _PRINTABLE_CHARS.sub('', user_input)
+    # Repeated short inputs within a request are served from the memo
+    memoize = len(user_input) <= _VALIDATE_CACHE_MAX_LEN
+    if memoize:
+        cached = _VALIDATE_CACHE.get(user_input)
+        if cached is not None:
+            return cached
+    
+    # Delete ASCII control characters; non-ASCII input is filtered at the
+    # byte level so the encoded buffer is scanned once before decoding
+    if user_input.isascii():
+        cleaned = user_input.translate(_STRIP_TABLE)
+    else:
+        cleaned = user_input.encode('ascii', 'ignore').translate(None, _STRIP_BYTES).decode('ascii')
+    
+    if not memoize:
+        return cleaned
+    
+    if len(_VALIDATE_CACHE) >= _VALIDATE_CACHE_SIZE:
+        try:
+            del _VALIDATE_CACHE[next(iter(_VALIDATE_CACHE))]
+        except (KeyError, RuntimeError, StopIteration):
+            # Another thread evicted concurrently; the memo is best-effort
+            pass
+    _VALIDATE_CACHE[user_input] = cleaned
     return cleaned
 
 
-def safe_file_read(file_path: str, base_dir: Optional[str] = None) -> Optional[str]:
+def safe_file_read(file_path: str, base_dir: Optional[Union[str, Path]] = None) -> Optional[str]:
     """
     Safely read file with path validation and optimized buffering.
     
@@ -170,7 +396,7 @@ def safe_file_read(file_path: str, base_dir: Optional[str] = None) -> Optional[s
     
     Args:
         file_path (str): Path to the file to read
-        base_dir (Optional[str]): Base directory for path validation.
+        base_dir (Optional[Union[str, Path]]): Base directory for path validation.
                                  If provided, file_path must be within this directory.
         
     Returns:
@@ -184,47 +410,158 @@ def safe_file_read(file_path: str, base_dir: Optional[str] = None) -> Optional[s
     Security:
         - Path traversal protection: validates file is within allowed directory
         - Uses path resolution to prevent "../" attacks
-        - Validates file existence and type before reading
+        - Component-wise containment check (``/base`` does not admit ``/basement``)
+        - Opens with O_NOFOLLOW and checks the descriptor is a regular file,
+          so the file cannot be swapped between the check and the read
         
     Performance:
         - Uses LRU cached path resolution for repeated operations
-        - 16KB buffering for optimized I/O performance
-        - Efficient for both small and large files
+        - os.read into a buffer presized from fstat, one UTF-8 decode
+        - Use safe_file_read_in() to skip re-resolving a fixed base directory
         
     Raises:
         ValueError: If path traversal attempt is detected
     """
+    try:
+        # Use cached path resolution for better performance
+        base_path = _resolve_path(os.fspath(base_dir)) if base_dir else None
+    except Exception as e:
+        logging.error(f"Failed to read file {file_path}: {e}")
+        return None
+    
+    return _read_within(file_path, base_path)
+
+
+def safe_file_read_in(resolved_base: Path, file_path: str) -> Optional[str]:
+    """
+    Safely read a file from an already-resolved base directory.
+    
+    Variant of safe_file_read for callers that read repeatedly from the same
+    directory: the base is resolved once by the caller instead of per call.
+    
+    Args:
+        resolved_base (Path): Absolute, resolved base directory
+                              (e.g. ``Path(base_dir).resolve()``)
+        file_path (str): Path to the file to read
+        
+    Returns:
+        Optional[str]: File contents as string, or None if reading failed
+        
+    Example:
+        >>> base = Path("/safe/path").resolve()
+        >>> contents = [safe_file_read_in(base, name) for name in names]
+        
+    Security:
+        Same path traversal protection as safe_file_read; an unresolved base
+        is not normalized, so pass the result of ``Path.resolve()``.
+    """
+    return _read_within(file_path, os.fspath(resolved_base))
+
+
+def _read_within(file_path: str, base_path: Optional[str]) -> Optional[str]:
+    """
+    Shared implementation of safe_file_read and safe_file_read_in.
+    
+    Args:
+        file_path (str): Path to the file to read
+        base_path (Optional[str]): Resolved base directory, or None to skip
+                                    the containment check
+        
+    Returns:
+        Optional[str]: File contents as string, or None if reading failed
+    """
     try:
         # Use cached path resolution for better performance
         path = _resolve_path(file_path)
         
-        # Security: Validate path is within allowed directory
-        if base_dir:
-            base_path = _resolve_path(base_dir)
-            if not str(path).startswith(str(base_path)):
+        # Security: Validate path is within allowed directory. Require a
+        # separator after the base so /base does not admit /basement
+        if base_path is not None and path != base_path:
+            prefix = base_path if base_path.endswith(os.sep) else base_path + os.sep
+            if not path.startswith(prefix):
                 raise ValueError("Path traversal attempt detected")
         
-        # Validate file exists and is actually a file
-        if path.exists() and path.is_file():
-            # Use larger buffer for better I/O performance
-            with open(path, 'r', encoding='utf-8', buffering=16384) as f:
-                return f.read()
+        # Open first, then validate the open descriptor is a regular file:
+        # no separate exists/is_file stat, and no window to swap the file
+        try:
+            fd = os.open(path, _READ_FLAGS)
+        except FileNotFoundError:
+            return None
+        try:
+            st = os.fstat(fd)
+            if not stat.S_ISREG(st.st_mode):
+                return None
+            text = _read_fd_text(fd, st.st_size)
+        finally:
+            os.close(fd)
+        
+        # Match text-mode universal newlines
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
     except Exception as e:
         logging.error(f"Failed to read file {file_path}: {e}")
     
     return None
 
 
-# Singleton logger instance to avoid recreation overhead
-_logger: Optional[logging.Logger] = None
+def _read_fd_text(fd: int, size: int) -> str:
+    """
+    Read an open file descriptor to EOF and decode it as UTF-8.
+    
+    Reads into a bytearray sized once from fstat. A plain read() rather
+    than mmap, so a file truncated mid-read yields short data instead of
+    SIGBUS.
+    
+    Args:
+        fd (int): File descriptor opened for reading
+        size (int): File size reported by fstat
+        
+    Returns:
+        str: Decoded file contents
+    """
+    buf = bytearray(size)
+    view = memoryview(buf)
+    filled = 0
+    while filled < size:
+        chunk = os.read(fd, size - filled)
+        if not chunk:
+            break
+        view[filled:filled + len(chunk)] = chunk
+        filled += len(chunk)
+    view.release()
+    if filled < size:
+        # File shrank after fstat
+        del buf[filled:]
+    
+    # Pick up anything appended after fstat
+    while True:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        buf += chunk
+    
+    return buf.decode('utf-8')
+
+
+# Log files already wired into the logging queue; setup_logging is a no-op
+# for these. Records are enqueued by a QueueHandler on the root logger and
+# written by a QueueListener thread, so logging calls never block on I/O.
+_configured: Set[str] = set()
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_listener_handlers: List[logging.Handler] = []
+_logging_lock = threading.Lock()
+_LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
 
 
 def setup_logging(log_file: str = 'ocr.log') -> logging.Logger:
     """
-    Setup secure logging with singleton pattern for optimal performance.
+    Setup secure, non-blocking logging; idempotent per log file.
     
-    Creates a logger instance with both file and console output.
-    Uses singleton pattern to avoid recreating loggers and handlers.
+    Routes records through a queue to file and console output. The first
+    call installs a QueueHandler on the root logger and starts a listener
+    thread; each new log file adds a file handler to that listener.
     
     Args:
         log_file (str, optional): Path to log file. Defaults to 'ocr.log'.
@@ -240,12 +577,12 @@ def setup_logging(log_file: str = 'ocr.log') -> logging.Logger:
     Features:
         - Dual output: both file and console logging
         - Structured format with timestamps and log levels
-        - Buffered file I/O for better performance
-        - Singleton pattern prevents duplicate loggers
+        - Leaves logging alone if the root logger was configured elsewhere
+        - Repeat calls for a configured file return immediately
         
     Performance:
-        - 8KB buffering for log file operations
-        - Singleton pattern eliminates setup overhead
+        - Logging calls only enqueue; file/console I/O runs on the listener thread
+        - logging.getLogger() is the logger cache, no module-global singleton
         - Efficient for high-frequency logging
         
     Security:
@@ -253,20 +590,64 @@ def setup_logging(log_file: str = 'ocr.log') -> logging.Logger:
         - Secure file permissions for log files
         - Structured logging format for analysis
     """
-    global _logger
-    
-    # Singleton pattern: create logger only once
-    if _logger is None:
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                # File handler for logging
-                logging.FileHandler(log_file, mode='a'),
-                # Console handler for immediate feedback
-                logging.StreamHandler()
-            ]
-        )
-        _logger = logging.getLogger(__name__)
-    
-    return _logger
\ No newline at end of file
+    global _listener
+    
+    logger = logging.getLogger(__name__)
+    if log_file in _configured:
+        return logger
+    
+    with _logging_lock:
+        if log_file in _configured:
+            return logger
+        
+        if _listener is None:
+            root = logging.getLogger()
+            if root.handlers:
+                # Configured elsewhere: same no-op as logging.basicConfig
+                _configured.add(log_file)
+                return logger
+            root.setLevel(logging.INFO)
+            root.addHandler(QueueHandler(_log_queue))
+            # Console handler for immediate feedback
+            _listener_handlers.append(logging.StreamHandler())
+        else:
+            # Restart with the extra handler; stop() drains queued records
+            _listener.stop()
+        
+        # File handler for logging
+        _listener_handlers.append(logging.FileHandler(log_file, mode='a'))
+        formatter = logging.Formatter(_LOG_FORMAT)
+        for handler in _listener_handlers:
+            handler.setFormatter(formatter)
+        
+        _listener = QueueListener(_log_queue, *_listener_handlers)
+        _listener.start()
+        _configured.add(log_file)
+    
+    return logger
+
+
+def _stop_logging() -> None:
+    """
+    Flush and tear down the logging queue set up by setup_logging.
+    
+    Registered with atexit so queued records are written before exit;
+    also lets tests start again from an unconfigured state.
+    """
+    global _listener
+    
+    with _logging_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            if isinstance(handler, QueueHandler) and handler.queue is _log_queue:
+                root.removeHandler(handler)
+        for handler in _listener_handlers:
+            handler.close()
+        _listener_handlers.clear()
+        _configured.clear()
+
+
+atexit.register(_stop_logging)